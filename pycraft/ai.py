@@ -0,0 +1,59 @@
+import time
+from settings import AI_PLAN_BUDGET_MS, AI_PRIORITY_DISTANCE
+
+
+class AIScheduler:
+    """Time-sliced enemy planning.
+
+    Steering stays in enemy.update, every simulated step. The expensive decisions (aiming,
+    attack selection, staff charge/stab planning) go in an optional enemy.plan(world, player),
+    which the scheduler calls round-robin until the step's millisecond budget is spent.
+    The longest-waiting enemies go first, with waits near the player counting for more. Waits
+    are kept across steps for every live enemy, so ones that are only due now and then (reduced
+    simulation tiers) keep building urgency until they win a turn.
+    """
+    def __init__(self, budget_ms=AI_PLAN_BUDGET_MS, priority_distance=AI_PRIORITY_DISTANCE):
+        self.budget = budget_ms / 1000
+        self.priority_distance = priority_distance  # Distance at which a wait counts half
+        self.waits = {}  # Enemy -> steps it was due since its last plan
+        self.planned = 0  # Plans run on the last step
+        self.spent = 0.0  # Seconds spent planning on the last step
+
+    def urgency(self, enemy, player):
+        """How overdue an enemy's plan is: steps waited, weighted by closeness to the player"""
+        dx = enemy.rect.centerx - player.rect.centerx
+        dy = enemy.rect.centery - player.rect.centery
+        distance = (dx * dx + dy * dy) ** 0.5
+        return self.waits[enemy] / (1 + distance / self.priority_distance)
+
+    def run(self, enemies, world, player, live=None):
+        """Plan as many of the due enemies as fit in the budget (always at least one), most urgent first.
+
+        live is every enemy still in the game; waits of any others are dropped (None keeps them all).
+        """
+        waits = self.waits
+        if live is not None:
+            live = set(live)
+            for enemy in [enemy for enemy in waits if enemy not in live]:
+                del waits[enemy]
+        due = [enemy for enemy in enemies if hasattr(enemy, 'plan')]
+        for enemy in due:
+            waits[enemy] = waits.get(enemy, 0) + 1
+        self.planned = 0
+        start = time.perf_counter()
+        deadline = start + self.budget
+        for enemy in sorted(due, key=lambda enemy: self.urgency(enemy, player), reverse=True):
+            enemy.plan(world, player)
+            self.waits[enemy] = 0
+            self.planned += 1
+            if time.perf_counter() >= deadline:
+                break
+        self.spent = time.perf_counter() - start
+
+    def stats(self):
+        """Plans run, time spent and the longest wait, for the profiler overlay"""
+        return {
+            'planned': self.planned,
+            'spent_ms': self.spent * 1000,
+            'max_wait': max(self.waits.values(), default=0),
+        }
@@ -1,173 +1,229 @@
-import pygame
 import math
-from settings import ARROW_BASE_SPEED, ARROW_MAX_SPEED, ARROW_GRAVITY, ARROW_BLUE_TINT, ARROW_TRAIL_COLOR, ARROW_PIERCE_COUNT, ARROW_PARTICLE_COLOR, PARTICLE_COUNT
+import weakref
+from settings import ARROW_BASE_SPEED, ARROW_MAX_SPEED, ARROW_BLUE_TINT, ARROW_TINT_ALPHA, ARROW_TRAIL_COLOR, ARROW_BLUR_DECAY, ARROW_BLUR_ALPHA, ARROW_POOL_SIZE, CULL_MARGIN
 from trail import Trail
+from blur import MotionBlur
+from rotation_cache import rotate
+from tint_cache import tint
+from projectiles import projectiles
+from render_queue import render_queue, LAYER_TRAILS, LAYER_PROJECTILES
+from quality import quality
 
 class Arrow:
-    def __init__(self, x, y, angle, image, power=1.0):
+    """One arrow: appearance and damage here, flight state in a ProjectileEngine slot"""
+    # Pooled and created in bursts, so keep instances small and fixed-layout
+    __slots__ = ('original_image', 'image', 'charge_power', 'color', 'damage', 'trail', 'engine', 'slot', 'ref',
+                 '__weakref__')
+
+    # SUPER MOTION BLUR for arrows - one accumulation buffer shared by all arrows
+    motion_blur = MotionBlur(ARROW_BLUR_DECAY, ARROW_BLUR_ALPHA)
+
+    def __init__(self, x, y, angle, image, power=1.0, engine=projectiles):
+        self.engine = engine
+        self.slot = None
+        self.ref = weakref.ref(self)  # Lets the engine find the arrow for a slot without keeping it alive
+        # Trail effect (kept across reuse, points come from the engine)
+        self.trail = Trail(ARROW_TRAIL_COLOR)
+        self.reset(x, y, angle, image, power)
+
+    @staticmethod
+    def launch_speed(power):
+        """Initial speed of an arrow loosed at a charge power (0.0 to 1.0)"""
+        return ARROW_BASE_SPEED + (ARROW_MAX_SPEED - ARROW_BASE_SPEED) * power
+
+    def reset(self, x, y, angle, image, power=1.0):
+        """(Re)launch the arrow - used by the constructor and by ArrowPool"""
         self.original_image = image
         # Apply blue tint to the arrow (can be overridden)
-        self.image = self.apply_blue_tint(image.copy())
-        self.rect = self.image.get_rect(center=(x, y))
-        
-        # Calculate speed based on power (0.0 to 1.0)
-        arrow_speed = ARROW_BASE_SPEED + (ARROW_MAX_SPEED - ARROW_BASE_SPEED) * power
-        
-        # Physics
-        self.vel_x = math.cos(angle) * arrow_speed
-        self.vel_y = math.sin(angle) * arrow_speed
-        self.angle = angle
-        self.alive = True
-        self.blocks_pierced = 0  # Track how many blocks have been pierced
+        self.image = tint(image, ARROW_BLUE_TINT + (ARROW_TINT_ALPHA,))
+
+        arrow_speed = Arrow.launch_speed(power)
+        if self.slot is not None:
+            self.engine.free(self.slot)
+        self.slot = self.engine.spawn(x, y, math.cos(angle) * arrow_speed, math.sin(angle) * arrow_speed, angle,
+                                      self.ref)
         self.charge_power = power  # Store charge power for damage calculation
-        
+
         # Enemy arrow properties
         self.color = None  # Custom color for enemy arrows
         self.damage = 15  # Default damage
-        self.is_enemy_arrow = False
-        
-        # Trail effect
-        self.trail = Trail(ARROW_TRAIL_COLOR)
-        self.trail.add_position(x, y)  # Add initial position
-        self.particle_system = None  # Will be set by player
-        
-        # SUPER MOTION BLUR for arrows
-        self.motion_blur_copies = []  # Store arrow positions for blur
-        self.max_blur_copies = 400  # EVEN MORE copies for arrows (they're fast!)
-        self.blur_alpha_decay = 0.94  # Much smoother, slower fade
-        
-    def apply_blue_tint(self, image):
-        """Apply a blue tint to the arrow image"""
-        # Create a surface with the blue tint color
-        tint_surface = pygame.Surface(image.get_size(), pygame.SRCALPHA)
-        tint_surface.fill(ARROW_BLUE_TINT + (128,))  # Add alpha for blending
-        
-        # Create a copy of the original image
-        tinted_image = image.copy()
-        # Blend the tint with the original image
-        tinted_image.blit(tint_surface, (0, 0), special_flags=pygame.BLEND_MULT)
-        
-        return tinted_image
-        
+        self.is_enemy_arrow = False  # Set by enemies on the arrows they fire
+
+    def retire(self):
+        """Give the flight slot back (the arrow must not be used again until reset)"""
+        if self.slot is not None:
+            self.engine.free(self.slot)
+            self.slot = None
+
+    def __del__(self):
+        # Enemy code drops dead arrows without releasing them
+        self.retire()
+
+    # --- Flight state, read from and written to the engine arrays ---
+
+    @property
+    def rect(self):
+        """Image-sized rect centered on the arrow. Read-only: it is built from the engine position on every
+        access, so changes to the returned Rect are not kept"""
+        rect = self.image.get_rect()
+        rect.center = (int(self.engine.x[self.slot]), int(self.engine.y[self.slot]))
+        return rect
+
+    @property
+    def center(self):
+        return (float(self.engine.x[self.slot]), float(self.engine.y[self.slot]))
+
+    @property
+    def prev_center(self):
+        return (float(self.engine.prev_x[self.slot]), float(self.engine.prev_y[self.slot]))
+
+    @property
+    def vel_x(self):
+        return float(self.engine.vel_x[self.slot])
+
+    @vel_x.setter
+    def vel_x(self, value):
+        self.engine.vel_x[self.slot] = value
+
+    @property
+    def vel_y(self):
+        return float(self.engine.vel_y[self.slot])
+
+    @vel_y.setter
+    def vel_y(self, value):
+        self.engine.vel_y[self.slot] = value
+
+    @property
+    def angle(self):
+        return float(self.engine.angle[self.slot])
+
+    @angle.setter
+    def angle(self, value):
+        self.engine.angle[self.slot] = value
+
+    @property
+    def alive(self):
+        return bool(self.engine.alive[self.slot])
+
+    @alive.setter
+    def alive(self, value):
+        self.engine.alive[self.slot] = value
+        self.engine.landed[self.slot] = False  # Used up - no more hits this step either
+
+    @property
+    def is_enemy_arrow(self):
+        return bool(self.engine.hostile[self.slot])
+
+    @is_enemy_arrow.setter
+    def is_enemy_arrow(self, value):
+        self.engine.hostile[self.slot] = value
+
+    @property
+    def blocks_pierced(self):
+        return int(self.engine.pierced[self.slot])
+
+    @blocks_pierced.setter
+    def blocks_pierced(self, value):
+        self.engine.pierced[self.slot] = value
+
+    @property
+    def particle_system(self):
+        return self.engine.particle_systems[self.slot]
+
+    @particle_system.setter
+    def particle_system(self, value):
+        self.engine.particle_systems[self.slot] = value
+
     def set_color(self, color):
         """Set custom color for enemy arrows"""
         self.color = color
         if color:
             # Apply custom color tint
-            tint_surface = pygame.Surface(self.original_image.get_size(), pygame.SRCALPHA)
-            tint_surface.fill(color + (128,))  # Add alpha for blending
-            
-            self.image = self.original_image.copy()
-            self.image.blit(tint_surface, (0, 0), special_flags=pygame.BLEND_MULT)
-        
-    def update(self, platforms):
-        """Update arrow physics and collision"""
-        if not self.alive:
-            return
-            
-        # Apply gravity
-        self.vel_y += ARROW_GRAVITY
-        
-        # Update position
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
-        
-        # Update rotation based on velocity BEFORE adding to trail
-        self.angle = math.atan2(self.vel_y, self.vel_x)
-        
-        # Add current position to trail (use center of arrow)
-        self.trail.add_position(self.rect.centerx, self.rect.centery)
-        
-        # SUPER MOTION BLUR UPDATE for arrows
-        arrow_speed = math.sqrt(self.vel_x**2 + self.vel_y**2)
-        if arrow_speed > 1.0:  # Only add blur when moving fast
-            # Dynamic blur count based on speed (faster arrows = MORE BLUR!)
-            speed_multiplier = min(arrow_speed / 8.0, 4.0)  # Cap at 4x multiplier
-            dynamic_max_copies = int(self.max_blur_copies * speed_multiplier)
-            dynamic_max_copies = max(30, dynamic_max_copies)  # Minimum 30 copies
-            
-            # Add current position to blur trail
-            if len(self.motion_blur_copies) >= dynamic_max_copies:
-                self.motion_blur_copies.pop(0)  # Remove oldest copy
-            
-            # Store position, angle, and alpha for blur effect
-            alpha = 28  # Even much lighter (85/3 = 28)
-            self.motion_blur_copies.append({
-                'x': self.rect.centerx,
-                'y': self.rect.centery,
-                'angle': self.angle,
-                'alpha': alpha,
-                'image': self.image.copy()
-            })
+            self.image = tint(self.original_image, tuple(color[:3]) + (ARROW_TINT_ALPHA,))
         
-        # Fade existing blur copies
-        for i in range(len(self.motion_blur_copies) - 1, -1, -1):
-            copy = self.motion_blur_copies[i]
-            copy['alpha'] *= self.blur_alpha_decay
-            if copy['alpha'] < 8:  # Remove very faded copies
-                self.motion_blur_copies.pop(i)
-        
-        # Check collision with platforms (with piercing) - more accurate collision
-        arrow_center = pygame.Rect(self.rect.centerx - 4, self.rect.centery - 4, 8, 8)
-        for platform in platforms:
-            if arrow_center.colliderect(platform):
-                if self.blocks_pierced < ARROW_PIERCE_COUNT:
-                    self.blocks_pierced += 1
-                    # Reduce speed when piercing
-                    self.vel_x *= 0.7
-                    self.vel_y *= 0.7
-                    # Create small particle effect when piercing
-                    if hasattr(self, 'particle_system') and self.particle_system:
-                        self.particle_system.create_explosion(
-                            self.rect.centerx, self.rect.centery, 
-                            ARROW_PARTICLE_COLOR, count=4
-                        )
-                    # Move arrow slightly forward to avoid getting stuck
-                    self.rect.x += self.vel_x * 0.5
-                    self.rect.y += self.vel_y * 0.5
-                else:
-                    # Create particle explosion when arrow dies
-                    if hasattr(self, 'particle_system') and self.particle_system:
-                        self.particle_system.create_explosion(
-                            self.rect.centerx, self.rect.centery, 
-                            ARROW_PARTICLE_COLOR, count=PARTICLE_COUNT
-                        )
-                    self.alive = False
-                    break
-                
-        # Remove arrow if it goes way off screen (very generous boundaries)
-        # This prevents arrows from existing forever but allows for large world coordinates
-        if (self.rect.centerx < -1000 or self.rect.centerx > 20000 or 
-            self.rect.centery < -1000 or self.rect.centery > 5000):
-            self.alive = False
-            
+    def update(self, world):
+        """Kept for callers that step their own arrows - the engine moves every arrow in bulk"""
+        pass
+
     def draw(self, screen, camera):
         """Draw the arrow on screen with SUPER MOTION BLUR"""
-        if not self.alive:
+        engine = self.engine
+        slot = self.slot
+        if not engine.alive[slot]:
+            return
+        center = camera.interpolate(self.prev_center, self.center)
+        speed = math.hypot(engine.vel_x[slot], engine.vel_y[slot])
+        # Skip everything when neither the arrow nor its trail can reach the screen
+        trail_length = quality.trail_length
+        if not camera.is_point_visible(center, CULL_MARGIN + speed * trail_length):
+            camera.count('arrows', 0, 1)
             return
             
         # Draw trail first (behind the arrow)
-        self.trail.draw(screen, camera)
-        
-        # DRAW MOTION BLUR COPIES FIRST (behind main arrow)
-        for copy in self.motion_blur_copies:
-            if copy['alpha'] > 8:  # Only draw visible copies
-                # Rotate the blur copy
-                blur_angle_degrees = math.degrees(copy['angle'])
-                blur_rotated = pygame.transform.rotate(copy['image'], -blur_angle_degrees)
-                blur_rect = blur_rotated.get_rect(center=(copy['x'], copy['y']))
-                
-                # Apply alpha transparency for blur effect
-                blur_surface = blur_rotated.copy()
-                blur_surface.set_alpha(int(copy['alpha']))
-                
-                # Draw the blur copy
-                screen.blit(blur_surface, camera.apply(blur_rect))
+        self.trail.positions = engine.trail_points(slot, trail_length)
+        render_queue.submit_call(LAYER_TRAILS, self.trail.draw, camera)
+        if not camera.is_point_visible(center, CULL_MARGIN, 'arrows'):
+            return
         
         # Rotate the arrow image based on its trajectory
-        angle_degrees = math.degrees(self.angle)
-        rotated_arrow = pygame.transform.rotate(self.image, -angle_degrees)
-        arrow_rect = rotated_arrow.get_rect(center=self.rect.center)
+        angle_degrees = math.degrees(engine.angle[slot])
+        rotated_arrow = rotate(self.image, -angle_degrees)
+        arrow_rect = rotated_arrow.get_rect(center=center)
+        
+        # Stamp into the shared blur buffer (only when moving fast, up to the frame's quality budget)
+        if speed > 1.0 and Arrow.motion_blur.stamps < quality.blur_stamps:
+            Arrow.motion_blur.stamp(rotated_arrow, center, camera)
         
         # Draw arrow normally without brightness overlay
-        screen.blit(rotated_arrow, camera.apply(arrow_rect))
\ No newline at end of file
+        render_queue.submit(rotated_arrow, arrow_rect.topleft, LAYER_PROJECTILES)
+    
+    @classmethod
+    def draw_motion_blur(cls, screen, camera):
+        """Fade and draw the blur shared by every arrow in flight (once per frame)"""
+        cls.motion_blur.begin_frame(screen, camera)
+        cls.motion_blur.draw(screen)
+
+
+class ArrowPool:
+    """Recycles dead arrows so firing doesn't allocate (rapid fire, volleys, enemy barrages)"""
+    def __init__(self, max_free=ARROW_POOL_SIZE):
+        self.max_free = max_free
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, x, y, angle, image, power=1.0):
+        """Return a launched arrow, reusing a released one when available"""
+        if self.free:
+            arrow = self.free.pop()
+            arrow.reset(x, y, angle, image, power)
+            self.reused += 1
+            return arrow
+        self.created += 1
+        return Arrow(x, y, angle, image, power)
+
+    def release(self, arrow):
+        """Hand an arrow back once nothing references it any more (releasing it again does nothing)"""
+        if arrow.slot is None:
+            # Already released: pooling it twice would hand the same arrow to two shots
+            return
+        arrow.retire()
+        if len(self.free) < self.max_free:
+            self.free.append(arrow)
+
+    def release_dead(self, arrows):
+        """Release the dead arrows in a list and return the living ones"""
+        living = []
+        for arrow in arrows:
+            if arrow.alive:
+                living.append(arrow)
+            else:
+                self.release(arrow)
+        return living
+
+    def stats(self):
+        return {'free': len(self.free), 'created': self.created, 'reused': self.reused}
+
+
+# Shared by the player's bow and anything else that fires arrows
+arrow_pool = ArrowPool()
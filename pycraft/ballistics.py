@@ -0,0 +1,95 @@
+import math
+import numpy as np
+from settings import (ARROW_BASE_SPEED, ARROW_MAX_SPEED, ARROW_GRAVITY, AIM_TABLE_CELL, AIM_TABLE_RANGE,
+                      AIM_TABLE_SPEEDS, AIM_TABLE_FAN, AIM_LEAD_ITERATIONS)
+
+
+class BallisticTable:
+    """Launch angles that hit a target offset under gravity, precomputed once for every launch speed.
+
+    Tables are indexed by (speed, dy, dx) over a grid of AIM_TABLE_CELL pixels, for dx >= 0 (the
+    other side is mirrored), and hold the direct (flatter) arc's angle and its flight time in steps.
+    Lookups interpolate between the eight surrounding entries, so aiming any number of archers
+    costs a few array operations. Targets out of reach come back as NaN.
+    """
+    def __init__(self, min_speed=ARROW_BASE_SPEED, max_speed=ARROW_MAX_SPEED, gravity=ARROW_GRAVITY,
+                 cell=AIM_TABLE_CELL, reach=AIM_TABLE_RANGE, speeds=AIM_TABLE_SPEEDS, fan=AIM_TABLE_FAN):
+        self.min_speed = min_speed
+        self.max_speed = max_speed
+        self.cell = cell
+        self.reach = reach
+        self.speeds = np.linspace(min_speed, max_speed, speeds)
+        xs = np.arange(0, reach + cell, cell, dtype=np.float64)
+        ys = np.arange(-reach, reach + cell, cell, dtype=np.float64)
+        self.angles = np.full((speeds, ys.size, xs.size), np.nan, np.float32)
+        self.times = np.full((speeds, ys.size, xs.size), np.nan, np.float32)
+
+        # Every launch angle from (almost) straight up to straight down, crossing each table column
+        thetas = np.linspace(-math.pi / 2, math.pi / 2, fan + 2)[1:-1]
+        columns = np.maximum(xs, 1.0)[:, None]
+        for index, speed in enumerate(self.speeds):
+            # Steps to reach each column, and the height there (the engine adds gravity before moving)
+            steps = columns / (speed * np.cos(thetas))
+            heights = steps * speed * np.sin(thetas) + gravity * steps * (steps + 1) / 2
+            for col in range(xs.size):
+                # The direct arc: from the highest reachable point down, height rises with the angle
+                apex = int(np.argmin(heights[col]))
+                arc = np.maximum.accumulate(heights[col, apex:])
+                reachable = ys >= arc[0]
+                self.angles[index, reachable, col] = np.interp(ys[reachable], arc, thetas[apex:])
+                self.times[index, reachable, col] = np.interp(ys[reachable], arc, steps[col, apex:])
+
+    def lookup(self, table, dx, dy, speed):
+        """Trilinear interpolation of a table at |dx|, dy and speed (NaN outside the table)"""
+        last_speed, last_row, last_col = (size - 1 for size in table.shape)
+        fs = np.clip((speed - self.min_speed) / (self.max_speed - self.min_speed), 0.0, 1.0) * last_speed
+        fy = (dy + self.reach) / self.cell
+        fx = np.abs(dx) / self.cell
+        inside = (fy >= 0) & (fy <= last_row) & (fx <= last_col)
+        fy = np.clip(fy, 0, last_row)
+        fx = np.clip(fx, 0, last_col)
+        s0 = np.minimum(fs.astype(np.intp), max(last_speed - 1, 0))
+        y0 = np.minimum(fy.astype(np.intp), last_row - 1)
+        x0 = np.minimum(fx.astype(np.intp), last_col - 1)
+        ws = fs - s0
+        wy = fy - y0
+        wx = fx - x0
+        result = 0.0
+        for ds, weight_s in ((0, 1 - ws), (1, ws)):
+            for dr, weight_y in ((0, 1 - wy), (1, wy)):
+                for dc, weight_x in ((0, 1 - wx), (1, wx)):
+                    result = result + weight_s * weight_y * weight_x * table[s0 + ds, y0 + dr, x0 + dc]
+        return np.where(inside, result, np.nan)
+
+    def solve(self, dx, dy, speed, vel_x=0.0, vel_y=0.0, lead_iterations=AIM_LEAD_ITERATIONS):
+        """Launch angles (radians) and flight times (steps) to hit targets at (dx, dy), in bulk.
+
+        Moving targets (vel_x, vel_y in pixels per step) are led by re-aiming at where they will
+        be after each estimated flight time. Unreachable targets give NaN.
+        """
+        dx = np.asarray(dx, np.float64)
+        dy = np.asarray(dy, np.float64)
+        speed = np.asarray(speed, np.float64)
+        aim_x = dx
+        aim_y = dy
+        times = self.lookup(self.times, aim_x, aim_y, speed)
+        for _ in range(lead_iterations if np.any(vel_x) or np.any(vel_y) else 0):
+            lead_times = np.nan_to_num(times)
+            aim_x = dx + vel_x * lead_times
+            aim_y = dy + vel_y * lead_times
+            times = self.lookup(self.times, aim_x, aim_y, speed)
+        angles = self.lookup(self.angles, aim_x, aim_y, speed)
+        # Mirror for targets on the left, back into (-pi, pi]
+        angles = np.where(aim_x < 0, np.pi - angles, angles)
+        angles = np.where(angles > np.pi, angles - 2 * np.pi, angles)
+        return angles, times
+
+    def aim(self, dx, dy, speed, vel_x=0.0, vel_y=0.0):
+        """Launch angle for one target, or None if it is out of reach"""
+        angles, _ = self.solve(dx, dy, speed, vel_x, vel_y)
+        angle = float(angles)
+        return None if math.isnan(angle) else angle
+
+
+# Built once, shared by the player's bow and enemy archers
+ballistics = BallisticTable()
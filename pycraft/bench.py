@@ -0,0 +1,288 @@
+# Scenario benchmarks for the pycraft hot paths, run headless against a software surface.
+# Usage: python bench.py [--scenario NAME ...] [--frames N] [--output results.json]
+# Each scenario runs in its own process, so caches, pools and the shared blur start cold every time.
+import headless  # Sets the SDL dummy drivers before pygame starts
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+import pygame
+
+from settings import *
+from player import Player
+from arrow import Arrow
+from trail import Trail
+from particle import ParticleSystem
+from projectiles import ProjectileEngine
+from tile_layer import TileLayer
+from render_queue import RenderQueue
+from headless import NO_KEYS, aim_at, special_script, walk_script
+from game import InputState
+
+BENCH_VIEW_SIZE = (1280, 720)
+
+
+def make_level(cols, rows, seed=0):
+    """Generate a hilly level with floating platforms; the spawn area stays clear"""
+    rng = random.Random(seed)
+    grid = [[' '] * cols for _ in range(rows)]
+    ground = 11
+    for col in range(cols):
+        if col > 10:
+            ground = max(11, min(rows - 3, ground + rng.choice((-1, 0, 0, 1))))
+        for row in range(ground, rows):
+            grid[row][col] = 'X'
+    for _ in range(cols // 4):
+        col = rng.randrange(12, cols - 6)
+        row = rng.randrange(2, 10)
+        for offset in range(rng.randrange(3, 7)):
+            grid[row][col + offset] = 'X'
+    return [''.join(row) for row in grid]
+
+
+class SubsystemTimer:
+    """Wraps methods with timers and collects per-frame totals for each subsystem"""
+    def __init__(self):
+        self.current = defaultdict(float)
+        self.frames = defaultdict(list)
+        self.patches = []
+
+    def wrap(self, owner, method_name, label):
+        """Replace owner.method_name with a timed version counted under label"""
+        original = getattr(owner, method_name)
+        current = self.current
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                current[label] += perf_counter() - start
+
+        setattr(owner, method_name, timed)
+        self.patches.append((owner, method_name, original, label))
+
+    def end_frame(self, frame_seconds):
+        """Close the frame: record each subsystem's total time (zero if it didn't run)"""
+        for _, _, _, label in self.patches:
+            self.frames[label].append(self.current.pop(label, 0.0))
+        self.frames['frame'].append(frame_seconds)
+
+    def restore(self):
+        """Put the original methods back"""
+        for owner, method_name, original, _ in reversed(self.patches):
+            setattr(owner, method_name, original)
+        self.patches.clear()
+
+
+def summarize(samples):
+    """Mean, p95 and p99 of per-frame samples, in milliseconds"""
+    ms = [sample * 1000 for sample in samples]
+    if len(ms) < 2:
+        value = ms[0] if ms else 0.0
+        return {'mean_ms': value, 'p95_ms': value, 'p99_ms': value}
+    cuts = statistics.quantiles(ms, n=100, method='inclusive')
+    return {
+        'mean_ms': round(statistics.fmean(ms), 4),
+        'p95_ms': round(cuts[94], 4),
+        'p99_ms': round(cuts[98], 4),
+    }
+
+
+# --- Scenarios ---
+# Each scenario returns (game options, per-frame input script); scripts may also spawn load
+
+def keep_arrows_in_flight(game, target):
+    """Top the player's arrows back up to target, fanned out across the sky"""
+    player = game.player
+    bow = game.bow
+    missing = target - len(player.arrows)
+    for i in range(missing):
+        bow.angle = -0.15 - 1.2 * (i / max(missing, 1))
+        arrow = bow.shoot_arrow()
+        if arrow:
+            arrow.particle_system = player.particle_system
+            player.arrows.append(arrow)
+
+
+def arrows_400_scenario():
+    def script(step, game):
+        keep_arrows_in_flight(game, 400)
+        return InputState(NO_KEYS, aim_at(game, (game.player.rect.centerx + 400, game.player.rect.centery)))
+    return {}, script
+
+
+def special_5s_scenario():
+    return {}, special_script
+
+
+def particles_5k_scenario():
+    def script(step, game):
+        particles = game.particle_system
+        while len(particles) < 5000:
+            x = game.player.rect.centerx + game.random.uniform(-500, 500)
+            y = game.player.rect.centery + game.random.uniform(-300, 100)
+            particles.create_explosion(x, y, ARROW_PARTICLE_COLOR, count=50, can_damage=True)
+        return InputState(NO_KEYS)
+    return {}, script
+
+
+def tilemap_200x50_scenario():
+    return {'level_map': make_level(200, 50)}, walk_script
+
+
+def enemies_100_scenario():
+    return {'level_map': make_level(200, 50), 'enemy_count': 100}, walk_script
+
+
+SCENARIOS = {
+    'arrows_400': ("400 arrows in flight", arrows_400_scenario),
+    'special_5s': ("special ability rapid fire for 5 s", special_5s_scenario),
+    'particles_5k': ("5k live particles", particles_5k_scenario),
+    'tilemap_200x50': ("walking across a 200x50 tile map", tilemap_200x50_scenario),
+    'enemies_100': ("100 enemies across a 200x50 tile map", enemies_100_scenario),
+}
+
+# Subsystems timed in every scenario. Since drawing goes through the render queue, the draw methods
+# only queue their blits: the blitting, Trail.draw and queued enemy draws all run (inclusively) in
+# render_queue.flush, so draw times from before the queue compare with the draw + flush sum
+SUBSYSTEMS = [
+    (Player, 'update', 'player.update'),
+    (ProjectileEngine, 'update', 'projectiles.update'),
+    (Arrow, 'draw', 'arrow.draw'),
+    (ParticleSystem, 'update', 'particles.update'),
+    (ParticleSystem, 'draw', 'particles.draw'),
+    (Trail, 'draw', 'trail.draw'),
+    (TileLayer, 'draw', 'tiles.draw'),
+    (RenderQueue, 'flush', 'render_queue.flush'),
+]
+
+
+def run_scenario(name, frames, seed=0):
+    """Run one scenario for a fixed number of frames and return its report"""
+    description, factory = SCENARIOS[name]
+    options, script = factory()
+    game = headless.create_game(BENCH_VIEW_SIZE, seed=seed, **options)
+    surface = pygame.Surface(BENCH_VIEW_SIZE)
+
+    def frame(step):
+        game.step(script(step, game))
+        game.draw(surface)
+
+    timer = SubsystemTimer()
+    for owner, method_name, label in SUBSYSTEMS:
+        timer.wrap(owner, method_name, label)
+
+    gc.collect()
+    collections_before = [stats['collections'] for stats in gc.get_stats()]
+    try:
+        for step in range(frames):
+            start = time.perf_counter()
+            frame(step)
+            timer.end_frame(time.perf_counter() - start)
+    finally:
+        timer.restore()
+    collections_after = [stats['collections'] for stats in gc.get_stats()]
+
+    # Allocation pass: same scenario continued under tracemalloc (slower, so untimed)
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    for step in range(frames, frames + min(frames, 120)):
+        frame(step)
+    _, peak = tracemalloc.get_traced_memory()
+    blocks_after = sys.getallocatedblocks()
+    tracemalloc.stop()
+
+    return {
+        'description': description,
+        'frames': frames,
+        'subsystems': {label: summarize(samples) for label, samples in timer.frames.items()},
+        'allocations': {
+            'gc_collections': [after - before for before, after in zip(collections_before, collections_after)],
+            'net_blocks': blocks_after - blocks_before,
+            'peak_traced_kb': round(peak / 1024, 1),
+        },
+        'live': {
+            'player_arrows': len(game.player.arrows),
+            'particles': len(game.particle_system) + len(game.player.particle_system),
+        },
+    }
+
+
+def run_isolated(name, frames, seed):
+    """Run one scenario in a fresh interpreter, so no cache, pool or blur state carries over from others"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'report.json')
+        command = [sys.executable, os.path.abspath(__file__), '--in-process', '--scenario', name,
+                   '--frames', str(frames), '--seed', str(seed), '--output', path]
+        # The game's own prints stay out of the report; show them only if the run fails
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            sys.stderr.write(result.stdout + result.stderr)
+            raise SystemExit(f"Scenario {name} failed")
+        with open(path) as f:
+            return json.load(f)['scenarios'][name]
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run pycraft scenario benchmarks")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable, default: all)")
+    parser.add_argument('--frames', type=int, default=SIMULATION_RATE * 5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write the JSON report to this file")
+    parser.add_argument('--in-process', action='store_true',
+                        help="Run every scenario in this process (shared caches and pools carry over, "
+                             "so results depend on scenario order)")
+    args = parser.parse_args()
+
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'scenarios': {},
+    }
+    for name in args.scenario or SCENARIOS:
+        if args.in_process:
+            result = run_scenario(name, args.frames, args.seed)
+        else:
+            result = run_isolated(name, args.frames, args.seed)
+        report['scenarios'][name] = result
+        frame = result['subsystems']['frame']
+        print(f"{name}: mean {frame['mean_ms']:.2f} ms, p95 {frame['p95_ms']:.2f} ms, "
+              f"p99 {frame['p99_ms']:.2f} ms per frame")
+        for label, stats in result['subsystems'].items():
+            if label != 'frame':
+                print(f"    {label:<18} mean {stats['mean_ms']:.3f}  p95 {stats['p95_ms']:.3f}  p99 {stats['p99_ms']:.3f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
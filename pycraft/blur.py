@@ -0,0 +1,106 @@
+import math
+import pygame
+from render_queue import render_queue, LAYER_BLUR
+
+
+class MotionBlur:
+    """Screen-space accumulation buffer: sprites are stamped in and fade out with simulated time.
+
+    Fading follows the render time the camera reports (in simulation steps), not the frame count,
+    so streaks are the same length at any frame rate.
+    """
+    def __init__(self, decay, alpha):
+        self.decay = decay  # Fraction of each stamp kept per simulation step
+        self.alpha = alpha  # Opacity of a fresh stamp when composited
+        self.buffer = None
+        self.offset = (0, 0)  # Camera offset the buffer contents line up with
+        self.dirty = None  # Screen area that may still hold visible stamps
+        self.render_steps = None  # Camera render time (steps) at the last begin_frame
+        self.idle_steps = 0.0
+        self.stamps = 0  # Stamps since the last begin_frame
+        # Steps until a full-strength stamp has faded to nothing
+        self.fade_steps = math.ceil(math.log(1 / 255) / math.log(decay))
+
+    def begin_frame(self, screen, camera):
+        """Scroll the buffer with the camera and fade everything stamped so far"""
+        offset = camera.camera.topleft
+        self.stamps = 0
+        # Simulated time since the last frame (one step on the first)
+        elapsed = 1.0 if self.render_steps is None else camera.render_steps - self.render_steps
+        self.render_steps = camera.render_steps
+        if self.buffer is None or self.buffer.get_size() != screen.get_size():
+            self.buffer = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+            self.dirty = None
+
+        if self.dirty is not None:
+            self.scroll(offset[0] - self.offset[0], offset[1] - self.offset[1])
+        self.offset = offset
+        if self.dirty is None or elapsed <= 0:
+            return
+
+        self.idle_steps += elapsed
+        if self.idle_steps > self.fade_steps:
+            # Multiplicative fading never quite reaches zero, so wipe the leftovers
+            self.buffer.fill((0, 0, 0, 0), self.dirty)
+            self.dirty = None
+            return
+        fade = round(255 * self.decay ** elapsed)
+        self.buffer.fill((255, 255, 255, fade), self.dirty, special_flags=pygame.BLEND_RGBA_MULT)
+
+    def scroll(self, dx, dy):
+        """Shift the buffer so old stamps stay attached to the world"""
+        if not dx and not dy:
+            return
+        self.buffer.scroll(dx, dy)
+        width, height = self.buffer.get_size()
+        # Surface.scroll leaves the uncovered strips untouched, so clear them
+        if dx > 0:
+            self.buffer.fill((0, 0, 0, 0), (0, 0, dx, height))
+        elif dx < 0:
+            self.buffer.fill((0, 0, 0, 0), (width + dx, 0, -dx, height))
+        if dy > 0:
+            self.buffer.fill((0, 0, 0, 0), (0, 0, width, dy))
+        elif dy < 0:
+            self.buffer.fill((0, 0, 0, 0), (0, height + dy, width, -dy))
+
+        self.dirty = self.dirty.move(dx, dy).clip(self.buffer.get_rect())
+        if not self.dirty:
+            self.dirty = None
+
+    def stamp(self, image, center, camera, alpha=None):
+        """Stamp a sprite centered on a world position; alpha defaults to the layer alpha"""
+        if self.buffer is None:
+            return
+        rect = image.get_rect(center=camera.apply_point(center))
+        if alpha is None or alpha >= self.alpha:
+            self.buffer.blit(image, rect)
+        else:
+            # Weaker stamps are pre-faded relative to the layer opacity
+            previous_alpha = image.get_alpha()
+            image.set_alpha(int(255 * alpha / self.alpha))
+            self.buffer.blit(image, rect)
+            image.set_alpha(previous_alpha)
+
+        self.stamps += 1
+        rect = rect.clip(self.buffer.get_rect())
+        if rect:
+            self.dirty = rect if self.dirty is None else self.dirty.union(rect)
+            self.idle_steps = 0.0
+
+    def draw(self, screen):
+        """Queue compositing the faded stamps onto the screen"""
+        # Queued as a call: this frame's stamps land after draw() and grow the dirty area before the flush
+        render_queue.submit_call(LAYER_BLUR, self.composite)
+
+    def composite(self, screen):
+        """Blit the dirty area of the stamp buffer onto the screen"""
+        if self.dirty is None:
+            return
+        self.buffer.set_alpha(self.alpha)
+        screen.blit(self.buffer, self.dirty.topleft, self.dirty)
+
+    def clear(self):
+        """Drop all accumulated stamps"""
+        if self.buffer is not None and self.dirty is not None:
+            self.buffer.fill((0, 0, 0, 0), self.dirty)
+        self.dirty = None
@@ -1,12 +1,17 @@
 import pygame
 import math
-import time
-from settings import BOW_TILT_ANGLE, BOW_OFFSET, BOW_CHARGE_TIME, BOW_SHAKE_INTENSITY, BOW_SHAKE_FREQUENCY, BOW_ARROW_OFFSET, BOW_ARROW_SCALE
-from arrow import Arrow
+from settings import BOW_TILT_ANGLE, BOW_OFFSET, BOW_CHARGE_TIME, BOW_SHAKE_INTENSITY, BOW_SHAKE_FREQUENCY, BOW_ARROW_OFFSET, BOW_ARROW_SCALE, ARROW_BLUE_TINT, ARROW_TINT_ALPHA
+from arrow import Arrow, arrow_pool
+from ballistics import ballistics
+from rotation_cache import rotate
+from tint_cache import tint
+from render_queue import render_queue, LAYER_WEAPONS
 
 class Bow:
-    def __init__(self, image, arrow_image):
+    def __init__(self, image, arrow_image, clock):
+        self.clock = clock
         self.image = image
+        self.flipped_image = pygame.transform.flip(image, True, False)  # Right-side bow, flipped once
         self.arrow_image = arrow_image
         self.angle = 0
         self.player_rect = None
@@ -27,8 +32,8 @@ class Bow:
         else:
             self.bow_arrow_image = None
         
-    def update(self, player_rect, right_click, camera, charge_time=0):
-        """Update bow position and rotation based on mouse position"""
+    def update(self, player_rect, right_click, camera, charge_time=0, mouse_pos=None):
+        """Update bow position and rotation based on mouse position (live mouse if none given)"""
         self.player_rect = player_rect
         self.is_drawn = right_click
         self.is_charging = charge_time > 0  # Track if actively charging
@@ -46,7 +51,7 @@ class Bow:
         # Calculate shake effect based on charge power
         if self.charge_power > 0:
             shake_intensity = self.charge_power * BOW_SHAKE_INTENSITY
-            shake_time = time.time() / BOW_SHAKE_FREQUENCY
+            shake_time = self.clock.time / BOW_SHAKE_FREQUENCY
             self.shake_offset_x = math.sin(shake_time * 10) * shake_intensity
             self.shake_offset_y = math.cos(shake_time * 12) * shake_intensity
         else:
@@ -54,12 +59,12 @@ class Bow:
             self.shake_offset_y = 0
         
         # Get mouse position
-        mouse_pos = pygame.mouse.get_pos()
+        if mouse_pos is None:
+            mouse_pos = pygame.mouse.get_pos()
         
         # Get world mouse position (accounting for camera transform)
         # Convert screen mouse coordinates to world coordinates
-        world_mouse_x = mouse_pos[0] - camera.camera.x
-        world_mouse_y = mouse_pos[1] - camera.camera.y
+        world_mouse_x, world_mouse_y = camera.screen_to_world(mouse_pos)
         
         # Calculate angle from player center to mouse in world coordinates
         dx = world_mouse_x - player_rect.centerx
@@ -84,10 +89,13 @@ class Bow:
         # Apply slight aimbot assist if enemy is provided
         final_angle = self.angle
         if enemy and hasattr(enemy, 'rect'):
-            # Calculate angle to enemy
+            # Calculate the launch angle that drops onto the enemy (leading it if it moves)
             dx = enemy.rect.centerx - arrow_x
             dy = enemy.rect.centery - arrow_y
-            angle_to_enemy = math.atan2(dy, dx)
+            angle_to_enemy = ballistics.aim(dx, dy, Arrow.launch_speed(self.charge_power),
+                                            getattr(enemy, 'vel_x', 0.0), getattr(enemy, 'vel_y', 0.0))
+            if angle_to_enemy is None:
+                angle_to_enemy = math.atan2(dy, dx)  # Out of reach: straight at it
             
             # Calculate angle difference
             angle_diff = angle_to_enemy - self.angle
@@ -102,7 +110,7 @@ class Bow:
             assist_amount = max(-max_assist, min(max_assist, angle_diff * 0.3))  # 30% of the angle diff, capped
             final_angle = self.angle + assist_amount
         
-        return Arrow(arrow_x, arrow_y, final_angle, self.arrow_image, self.charge_power)
+        return arrow_pool.acquire(arrow_x, arrow_y, final_angle, self.arrow_image, self.charge_power)
         
     def reset(self):
         """Reset bow state"""
@@ -113,17 +121,15 @@ class Bow:
         self.shake_offset_y = 0
         self.is_charging = False
         
-    def draw(self, screen, camera):
-        """Draw the bow at the player's position (only when drawn)"""
+    def draw(self, screen, camera, anchor=None):
+        """Draw the bow at the player's position (only when drawn); anchor overrides the player center"""
         if not self.player_rect or not self.is_drawn:
             return
+        anchor_x, anchor_y = anchor if anchor else self.player_rect.center
         
         # Position bow with a slight offset towards the cursor and add shake
-        bow_x = self.player_rect.centerx + math.cos(self.angle) * BOW_OFFSET + self.shake_offset_x
-        bow_y = self.player_rect.centery + math.sin(self.angle) * BOW_OFFSET + self.shake_offset_y
-        
-        # Apply camera transform to get screen position
-        screen_pos = camera.apply_point((bow_x, bow_y))
+        bow_x = anchor_x + math.cos(self.angle) * BOW_OFFSET + self.shake_offset_x
+        bow_y = anchor_y + math.sin(self.angle) * BOW_OFFSET + self.shake_offset_y
         
         # Determine if we need to flip the image and add rotation offset
         is_flipped = False
@@ -137,12 +143,12 @@ class Bow:
             rotation_offset = -BOW_TILT_ANGLE  # Use setting for left side
 
         # Rotate bow image to point toward mouse with additional offset
-        image_to_rotate = pygame.transform.flip(self.image, is_flipped, False)
-        rotated_bow = pygame.transform.rotate(image_to_rotate, -angle_degrees - 90 + rotation_offset)
-        bow_rect = rotated_bow.get_rect(center=screen_pos)
+        image_to_rotate = self.flipped_image if is_flipped else self.image
+        rotated_bow = rotate(image_to_rotate, -angle_degrees - 90 + rotation_offset)
+        bow_rect = rotated_bow.get_rect(center=(bow_x, bow_y))
         
         # Draw bow normally without brightness overlay
-        screen.blit(rotated_bow, bow_rect)
+        render_queue.submit(rotated_bow, bow_rect.topleft, LAYER_WEAPONS)
         
         # Draw arrow if charging
         if self.is_charging and self.bow_arrow_image:
@@ -150,15 +156,7 @@ class Bow:
             
     def apply_blue_tint_to_bow_arrow(self, image):
         """Apply blue tint to the bow arrow"""
-        # Create a surface with blue tint
-        tint_surface = pygame.Surface(image.get_size(), pygame.SRCALPHA)
-        tint_surface.fill((100, 150, 255, 128))  # Blue tint with alpha
-        
-        # Create a copy and blend
-        tinted_image = image.copy()
-        tinted_image.blit(tint_surface, (0, 0), special_flags=pygame.BLEND_MULT)
-        
-        return tinted_image
+        return tint(image, ARROW_BLUE_TINT + (ARROW_TINT_ALPHA,))
         
     def draw_bow_arrow(self, screen, camera, bow_x, bow_y, angle_degrees, is_flipped):
         """Draw the arrow being held in the bow"""
@@ -169,12 +167,9 @@ class Bow:
         arrow_x = bow_x - math.cos(self.angle) * pullback_distance
         arrow_y = bow_y - math.sin(self.angle) * pullback_distance
         
-        # Apply camera transform
-        screen_arrow_pos = camera.apply_point((arrow_x, arrow_y))
-        
         # Rotate arrow to match bow angle (don't flip the arrow, only rotate)
-        rotated_arrow = pygame.transform.rotate(self.bow_arrow_image, -angle_degrees)  # Match bow direction exactly
-        arrow_rect = rotated_arrow.get_rect(center=screen_arrow_pos)
+        rotated_arrow = rotate(self.bow_arrow_image, -angle_degrees)  # Match bow direction exactly
+        arrow_rect = rotated_arrow.get_rect(center=(arrow_x, arrow_y))
         
         # Draw charged arrow normally without brightness overlay
-        screen.blit(rotated_arrow, arrow_rect)
\ No newline at end of file
+        render_queue.submit(rotated_arrow, arrow_rect.topleft, LAYER_WEAPONS)
\ No newline at end of file
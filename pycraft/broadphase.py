@@ -0,0 +1,114 @@
+import numpy as np
+from settings import BROADPHASE_CELL_SIZE, ARROW_HITBOX_SIZE
+
+# Entity teams: projectiles only hit entities on the other side
+TEAM_PLAYER = 0
+TEAM_ENEMY = 1
+
+# Cell key = row * stride + col; unique for any column within a million cells of the origin
+CELL_KEY_STRIDE = 1 << 20
+
+
+class Broadphase:
+    """Uniform spatial hash of this step's entities and projectile paths, rebuilt every step.
+
+    query() hashes every target rect and every in-flight projectile path into grid cells,
+    joins them on shared cells, then runs the exact swept test only on those pairs.
+    """
+    def __init__(self, cell_size=BROADPHASE_CELL_SIZE, pad=ARROW_HITBOX_SIZE // 2):
+        self.cell_size = cell_size
+        self.pad = pad  # Projectile hitbox half size, grown onto each target
+        self.candidates = 0  # Pairs that reached the narrow phase on the last query
+
+    def cell_keys(self, left, top, right, bottom):
+        """Hash keys of every cell overlapped by each box, as (keys, box index) arrays"""
+        size = self.cell_size
+        col0 = np.floor_divide(left, size).astype(np.int64)
+        row0 = np.floor_divide(top, size).astype(np.int64)
+        cols = np.floor_divide(right, size).astype(np.int64) - col0 + 1
+        rows = np.floor_divide(bottom, size).astype(np.int64) - row0 + 1
+        keys = []
+        owners = []
+        index = np.arange(np.size(left))
+        # Boxes are small next to a cell, so this is usually a single 1x1 or 2x2 pass
+        for dr in range(int(rows.max(initial=0))):
+            for dc in range(int(cols.max(initial=0))):
+                covered = (dr < rows) & (dc < cols)
+                keys.append((row0[covered] + dr) * CELL_KEY_STRIDE + (col0[covered] + dc))
+                owners.append(index[covered])
+        if not keys:
+            return np.empty(0, np.int64), np.empty(0, np.intp)
+        return np.concatenate(keys), np.concatenate(owners)
+
+    def query(self, engine, targets):
+        """Return (slot, target, t) for every projectile hitting a target this step, earliest hit only.
+
+        targets is a list of (entity, team); entity.rect is used. Results are in path order (by t).
+        """
+        slots = engine.in_flight()
+        if not slots.size or not targets:
+            self.candidates = 0
+            return []
+
+        # Targets: padded rects, hashed into cells (a handful of entities)
+        pad = self.pad
+        rects = [entity.rect for entity, _ in targets]
+        left = np.array([rect.left - pad for rect in rects], np.float64)
+        top = np.array([rect.top - pad for rect in rects], np.float64)
+        right = np.array([rect.right + pad for rect in rects], np.float64)
+        bottom = np.array([rect.bottom + pad for rect in rects], np.float64)
+        teams = np.array([team for _, team in targets], np.int8)
+        target_keys, target_owner = self.cell_keys(left, top, right, bottom)
+        order = np.argsort(target_keys, kind='stable')
+        target_keys = target_keys[order]
+        target_owner = target_owner[order]
+
+        # Projectiles: the bounding box of this step's path
+        x0 = engine.prev_x[slots]
+        y0 = engine.prev_y[slots]
+        x1 = engine.x[slots]
+        y1 = engine.y[slots]
+        path_keys, path_owner = self.cell_keys(np.minimum(x0, x1), np.minimum(y0, y1),
+                                               np.maximum(x0, x1), np.maximum(y0, y1))
+
+        # Join on shared cells: every (path, target) pair that meets in at least one cell
+        first = np.searchsorted(target_keys, path_keys, 'left')
+        last = np.searchsorted(target_keys, path_keys, 'right')
+        matches = last - first
+        if not matches.any():
+            self.candidates = 0
+            return []
+        pair_path = np.repeat(path_owner, matches)
+        offsets = np.arange(matches.sum()) - np.repeat(np.cumsum(matches) - matches, matches)
+        pair_target = target_owner[np.repeat(first, matches) + offsets]
+
+        # Each pair once, and only across teams
+        pairs = np.unique(pair_path * len(targets) + pair_target)
+        pair_path = pairs // len(targets)
+        pair_target = pairs % len(targets)
+        pair_slots = slots[pair_path]
+        hostile_team = np.where(engine.hostile[pair_slots], TEAM_ENEMY, TEAM_PLAYER)
+        opposed = hostile_team != teams[pair_target]
+        pair_slots = pair_slots[opposed]
+        pair_target = pair_target[opposed]
+        self.candidates = pair_slots.size
+        if not pair_slots.size:
+            return []
+
+        # Narrow phase: exact swept test, then each projectile's earliest hit
+        t = engine.sweep_boxes(pair_slots, left[pair_target], top[pair_target],
+                               right[pair_target], bottom[pair_target])
+        hit = np.isfinite(t)
+        pair_slots = pair_slots[hit]
+        pair_target = pair_target[hit]
+        t = t[hit]
+        order = np.lexsort((t, pair_slots))
+        pair_slots = pair_slots[order]
+        keep = np.ones(pair_slots.size, np.bool_)
+        keep[1:] = pair_slots[1:] != pair_slots[:-1]
+        pair_slots = pair_slots[keep]
+        pair_target = pair_target[order][keep]
+        t = t[order][keep]
+        by_time = np.argsort(t, kind='stable')
+        return [(slot, targets[target][0], hit_time) for slot, target, hit_time in
+                zip(pair_slots[by_time].tolist(), pair_target[by_time].tolist(), t[by_time].tolist())]
@@ -6,6 +6,15 @@ class Camera:
         self.width = width
         self.height = height
         self.lerp_factor = 0.1
+        # Simulated offset (updated per step) and the previous step's, for interpolation
+        self.position = (0.0, 0.0)
+        self.prev_position = self.position
+        self.alpha = 1.0  # Render interpolation factor between the last two steps
+        self.render_steps = 0.0  # Simulated time being rendered, in steps (for time-based effects)
+        # Visible world area for this frame, and per-kind draw/cull counts (reset every frame)
+        self.view = pygame.Rect(0, 0, width, height)
+        self.drawn = {}
+        self.culled = {}
 
     def apply(self, entity_rect):
         return entity_rect.move(self.camera.topleft)
@@ -13,6 +22,15 @@ class Camera:
     def apply_point(self, point):
         return (point[0] + self.camera.left, point[1] + self.camera.top)
 
+    def screen_to_world(self, point):
+        """Convert a screen point (e.g. the mouse) to world coordinates using the simulated view"""
+        return (point[0] - self.position[0], point[1] - self.position[1])
+
+    def simulated_rect(self, margin=0):
+        """World rect of the simulated view (not this frame's interpolated one), grown by margin on every side"""
+        return pygame.Rect(-self.position[0] - margin, -self.position[1] - margin,
+                           self.width + margin * 2, self.height + margin * 2)
+
     def update(self, target_rect, mouse_pos):
         target_x = -target_rect.centerx + int(self.width / 2)
         target_y = -target_rect.centery + int(self.height / 2)
@@ -23,13 +41,71 @@ class Camera:
         target_x -= mouse_offset_x
         target_y -= mouse_offset_y
 
-        new_x = self.camera.x + (target_x - self.camera.x) * self.lerp_factor
-        new_y = self.camera.y + (target_y - self.camera.y) * self.lerp_factor
-        
-        self.camera = pygame.Rect(new_x, new_y, self.width, self.height)
+        x, y = self.position
+        self.prev_position = self.position
+        self.position = (x + (target_x - x) * self.lerp_factor, y + (target_y - y) * self.lerp_factor)
+
+    def begin_render(self, alpha, steps=0):
+        """Place the render view between the last two simulated positions (steps: simulation steps run)"""
+        self.alpha = alpha
+        self.render_steps = steps + alpha
+        x, y = self.interpolate(self.prev_position, self.position)
+        self.camera = pygame.Rect(x, y, self.width, self.height)
+        self.view = pygame.Rect(-self.camera.x, -self.camera.y, self.width, self.height)
+        self.drawn.clear()
+        self.culled.clear()
+
+    # --- Culling: draw code asks before transforming and blitting ---
+
+    def visible_rect(self, margin=0):
+        """World rect on screen this frame, grown by margin on every side"""
+        return self.view.inflate(margin * 2, margin * 2)
+
+    def count(self, kind, drawn, culled=0):
+        """Record draw/cull decisions made outside is_visible (e.g. in bulk)"""
+        self.drawn[kind] = self.drawn.get(kind, 0) + drawn
+        self.culled[kind] = self.culled.get(kind, 0) + culled
+
+    def is_visible(self, rect, margin=0, kind=None):
+        """True if a world rect is within margin of the view; counted under kind if given"""
+        view = self.view
+        visible = (rect.right > view.left - margin and rect.left < view.right + margin
+                   and rect.bottom > view.top - margin and rect.top < view.bottom + margin)
+        if kind is not None:
+            if visible:
+                self.drawn[kind] = self.drawn.get(kind, 0) + 1
+            else:
+                self.culled[kind] = self.culled.get(kind, 0) + 1
+        return visible
+
+    def is_point_visible(self, point, margin=0, kind=None):
+        """True if a world point is within margin of the view (margin = sprite half size)"""
+        view = self.view
+        visible = (view.left - margin <= point[0] < view.right + margin
+                   and view.top - margin <= point[1] < view.bottom + margin)
+        if kind is not None:
+            if visible:
+                self.drawn[kind] = self.drawn.get(kind, 0) + 1
+            else:
+                self.culled[kind] = self.culled.get(kind, 0) + 1
+        return visible
+
+    def cull_stats(self):
+        """Drawn/culled counts per kind for the last frame, plus totals"""
+        stats = {kind: {'drawn': self.drawn.get(kind, 0), 'culled': self.culled.get(kind, 0)}
+                 for kind in set(self.drawn) | set(self.culled)}
+        stats['total'] = {'drawn': sum(self.drawn.values()), 'culled': sum(self.culled.values())}
+        return stats
+
+    def interpolate(self, previous, current):
+        """Blend a point between its previous and current simulated positions"""
+        alpha = self.alpha
+        return (previous[0] + (current[0] - previous[0]) * alpha,
+                previous[1] + (current[1] - previous[1]) * alpha)
 
     def resize(self, width, height):
         self.width = width
         self.height = height
         self.camera.width = width
         self.camera.height = height
+        self.view.size = (width, height)
@@ -0,0 +1,312 @@
+import pygame
+import os
+import random
+import numpy as np
+
+from settings import *
+from player import Player
+from bow import Bow
+from arrow import Arrow
+from camera import Camera
+from world import TileGrid
+from tile_layer import TileLayer
+from item import BowItem
+try:
+    from dummy_enemy import Enemy
+except ImportError:  # Not in every checkout (e.g. a CI box): use the minimal stand-in
+    from stand_ins import Enemy
+from particle import ParticleSystem
+from timing import SimClock
+from projectiles import projectiles
+from broadphase import Broadphase, TEAM_PLAYER, TEAM_ENEMY
+from hitmask import arrow_hit_time
+from profiler import FrameProfiler
+from lod import SimulationLOD, LOD_FULL
+from ai import AIScheduler
+from navigation import NavGraph
+from ballistics import ballistics
+from hud import Hud, every_frame
+from render_queue import render_queue, LAYER_BACKGROUND, LAYER_ENTITIES
+from quality import quality
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+
+# X = Ground Block - Flat map for easier combat
+LEVEL_MAP = [
+    "                                                                                ",
+    "                                                                                ",
+    "                                                                                ",
+    "                                                                                ",
+    "                                                                                ",
+    "                                                                                ",
+    "                                                                                ",
+    "                                                                                ",
+    "                                                                                ",
+    "                                                                                ",
+    "                                                                                ",
+    "XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX",
+    "XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX",
+]
+
+
+class Assets:
+    """Images shared by the game world, loaded once"""
+    def __init__(self, view_size):
+        player_img = pygame.image.load(os.path.join(ASSETS_DIR, 'texture', 'player.png')).convert_alpha()
+        self.player = pygame.transform.scale(player_img, (PLAYER_WIDTH, PLAYER_HEIGHT))
+        dirt_img = pygame.image.load(os.path.join(ASSETS_DIR, 'texture', 'dirt.png')).convert()
+        self.dirt = pygame.transform.scale(dirt_img, (TILE_SIZE, TILE_SIZE))
+
+        # Load bow image
+        bow_img = pygame.image.load(os.path.join(ASSETS_DIR, 'texture', 'bow.png')).convert_alpha()
+        bow_h = PLAYER_HEIGHT * BOW_SIZE
+        bow_w = int(bow_img.get_width() * (bow_h / bow_img.get_height()))
+        self.bow = pygame.transform.scale(bow_img, (bow_w, bow_h))
+
+        # Load arrow image
+        arrow_img = pygame.image.load(os.path.join(ASSETS_DIR, 'texture', 'arrow.png')).convert_alpha()
+        arrow_h = PLAYER_HEIGHT * ARROW_SIZE
+        arrow_w = int(arrow_img.get_width() * (arrow_h / arrow_img.get_height()))
+        self.arrow = pygame.transform.scale(arrow_img, (arrow_w, arrow_h))
+
+        # Load staff image for enemy
+        staff_img = pygame.image.load(os.path.join(ASSETS_DIR, 'texture', 'staff.png')).convert_alpha()
+        staff_h = PLAYER_HEIGHT * 2  # Make staff bigger than player
+        staff_w = int(staff_img.get_width() * (staff_h / staff_img.get_height()))
+        self.staff = pygame.transform.scale(staff_img, (staff_w, staff_h))
+
+        self.build_background(view_size)
+
+    def build_background(self, view_size):
+        """(Re)build the background gradient for a view size"""
+        width, height = view_size
+        # Create lighter blue gradient background for better motion blur visibility
+        self.background = pygame.Surface((width + 200, height + 200))
+        # Create vertical gradient from light blue to lighter blue
+        for y in range(height + 200):
+            # Interpolate between light blue and lighter blue
+            progress = y / (height + 200)
+            light_blue = (120, 160, 200)  # Light blue at top
+            lighter_blue = (180, 220, 255)  # Lighter blue at bottom
+
+            # Blend colors
+            r = int(light_blue[0] * (1 - progress) + lighter_blue[0] * progress)
+            g = int(light_blue[1] * (1 - progress) + lighter_blue[1] * progress)
+            b = int(light_blue[2] * (1 - progress) + lighter_blue[2] * progress)
+
+            pygame.draw.line(self.background, (r, g, b), (0, y), (width + 200, y))
+
+
+class InputState:
+    """Player input for one simulation step, from the keyboard or a script"""
+    def __init__(self, keys, mouse_pos=(0, 0), left_click=False, right_click=False,
+                 jump_pressed=False, jump_released=False, dash_pressed=False):
+        self.keys = keys  # Indexable by pygame key constants
+        self.mouse_pos = mouse_pos
+        self.left_click = left_click
+        self.right_click = right_click
+        # Edge-triggered inputs: true only on the step they happened
+        self.jump_pressed = jump_pressed
+        self.jump_released = jump_released
+        self.dash_pressed = dash_pressed
+
+
+class Game:
+    """The simulated world - level, player, enemies and particles - independent of any display"""
+    def __init__(self, assets, view_size, level_map=LEVEL_MAP, enemy_count=1, seed=None, hud_size=None):
+        self.assets = assets
+        self.view_width, self.view_height = view_size
+        self.random = random.Random(seed)
+
+        # Tile grid for collision queries - entities only check the cells they touch
+        self.world = TileGrid(level_map)
+        print(f"Level data loaded: {self.world.cols}x{self.world.rows} tiles, {len(self.world)} solid.")
+        self.tile_layer = TileLayer(self.world, assets.dirt)
+        # Walkable surfaces, jump/drop links and spawn points, built once per level
+        self.navigation = NavGraph(self.world)
+
+        # One simulation clock shared by every subsystem
+        self.clock = SimClock()
+        self.profiler = FrameProfiler()
+
+        self.bow = Bow(assets.bow, assets.arrow, self.clock)
+        self.player = Player(100, 10 * TILE_SIZE - PLAYER_HEIGHT, assets.player, self.bow, self.clock)
+
+        # Create items and add to hotbar
+        bow_item = BowItem(self.bow, assets.bow)
+        self.player.hotbar.add_item(bow_item, 0)    # Add bow to slot 1
+        self.player.hotbar.select_slot(0)  # Start with bow selected
+
+        # Create particle system
+        self.particle_system = ParticleSystem(self.clock, seed=seed)
+
+        self.enemies = []
+        self.spawn_enemies(enemy_count)
+        # Give player reference to first enemy for aimbot assist
+        self.player.enemy_target = self.enemies[0] if self.enemies else None
+
+        self.camera = Camera(self.view_width, self.view_height)
+        self.broadphase = Broadphase()
+        self.lod = SimulationLOD()
+        self.ai = AIScheduler()
+
+        # Player UI, cached: widgets redraw only when their state changes
+        player = self.player
+        self.hud = Hud(hud_size or view_size)
+        self.hud.add(player.hotbar.rect, player.hotbar.state, player.hotbar.draw)
+        # (a health tank without state() animates on its own, so it's redrawn every frame)
+        self.hud.add(pygame.Rect(HEALTH_TANK_X, HEALTH_TANK_Y, HEALTH_TANK_WIDTH, HEALTH_TANK_HEIGHT).inflate(16, 16),
+                     getattr(player.health_bar, 'state', every_frame), player.draw_health)
+        self.hud.add((MANA_BAR_X - 2, MANA_BAR_Y - 2, MANA_LABEL_WIDTH, MANA_BAR_HEIGHT + 30),
+                     lambda: (player.mana, player.max_mana), player.draw_mana_bar)
+
+    def spawn_enemies(self, count):
+        """Spawn DEADLY ARCHER ENEMIES on random walkable surfaces"""
+        platform_positions = self.navigation.spawn_points()
+        selected_positions = self.random.sample(platform_positions, min(count, len(platform_positions)))
+
+        for i, (x, y) in enumerate(selected_positions):
+            enemy = Enemy(x, y, self.assets.player, self.assets.bow)
+            enemy.particle_system = self.particle_system  # Connect particle system to enemy
+            enemy.navigation = self.navigation  # Shared pathfinding for chasing the player
+            self.enemies.append(enemy)
+            print(f"Spawned enemy #{i+1} on platform at ({x}, {y})")
+        self.aim_enemies()
+
+    def aim_enemies(self, speed=ARROW_MAX_SPEED):
+        """Point every enemy's bow along the arc that lands on the player, all in one table lookup"""
+        if not self.enemies:
+            return
+        target_x, target_y = self.player.rect.center
+        dx = np.array([target_x - enemy.rect.centerx for enemy in self.enemies], np.float64)
+        dy = np.array([target_y - enemy.rect.centery for enemy in self.enemies], np.float64)
+        angles, _ = ballistics.solve(dx, dy, speed, self.player.vel_x, self.player.vel_y)
+        # Out of reach: point straight at the player
+        angles = np.where(np.isnan(angles), np.arctan2(dy, dx), angles)
+        for enemy, angle in zip(self.enemies, angles.tolist()):
+            enemy.angle = angle
+
+    def step(self, inputs):
+        """Advance the whole world by one fixed simulation step"""
+        self.clock.tick()
+        player = self.player
+        particle_system = self.particle_system
+        profiler = self.profiler
+
+        player.update(self.world, inputs.jump_pressed, inputs.left_click, self.camera, inputs.jump_released,
+                      inputs.right_click, inputs.keys, inputs.mouse_pos, inputs.dash_pressed)
+        profiler.lap('player')
+
+        # Every arrow in flight, player and enemy, advanced in one bulk step
+        # (impact effects only on or near the screen, as far out as the quality level allows)
+        effects_area = self.camera.simulated_rect(quality.effects_margin)
+        particle_system.effects_area = effects_area
+        projectiles.update(self.world, effects_area)
+        profiler.lap('projectiles')
+
+        # Enemy decisions, amortized across steps under a time budget (sleeping enemies don't think)
+        due = self.lod.plan(self.enemies, self.camera)
+        self.ai.run([enemy for enemy, _, _ in due], self.world, player, self.enemies)
+        profiler.lap('ai')
+
+        # Update enemies - THEY'RE ALL HUNTING YOU! (ones far off screen at a reduced rate or asleep)
+        for enemy, steps, tier in due:
+            near = tier == LOD_FULL
+            for _ in range(steps):
+                # Update enemy AI with particle system (damaging staff particles at every tier; cosmetic
+                # bursts out of sight are dropped by the system's effects area)
+                enemy.update(self.world, player, particle_system)
+
+            # Check collision between player and enemy (only near ones can touch)
+            if near:
+                player.check_enemy_collision(enemy)
+        profiler.lap('enemies')
+
+        # Arrows against entities: one broadphase query for every projectile and target
+        targets = [(player, TEAM_PLAYER)]
+        targets.extend((enemy, TEAM_ENEMY) for enemy in self.enemies)
+        for slot, target, hit_time in self.broadphase.query(projectiles, targets):
+            arrow = projectiles.arrow(slot)
+            if arrow is None:
+                continue
+            # Rects overlap - now the pixel-accurate test, with the cached masks
+            hit_time = arrow_hit_time(arrow, target, hit_time)
+            if hit_time is None:
+                continue
+            if target is player:
+                # Enemy arrow hit the player! (the enemy drops it from its list once dead)
+                player.take_damage(arrow.damage)
+                print(f"Player hit by enemy arrow! Damage: {arrow.damage}")
+                arrow.alive = False
+            else:
+                player.resolve_arrow_hit(arrow, target, hit_time)
+        profiler.lap('collisions')
+
+        particle_system.update()  # Update particles
+
+        # Staff attacks now create particle explosions instead of direct damage
+
+        # Check if particles hit player
+        particle_damage = particle_system.check_player_collisions(player.rect, player.hit_mask())
+        if particle_damage > 0:
+            player.take_damage(particle_damage)
+            print(f"Particle hit! Damage: {particle_damage}, Player health: {player.health_bar.current_health}")
+        profiler.lap('particles')
+
+        self.camera.update(player.rect, inputs.mouse_pos)
+        profiler.lap('camera')
+
+    def resize(self, view_size, hud_size=None):
+        """Change the world view (a new internal resolution, which is also the zoom) and the HUD's surface size"""
+        # Culling, the simulation tiers and the effects area are read from the camera, so they follow it
+        self.view_width, self.view_height = view_size
+        self.camera.resize(self.view_width, self.view_height)
+        self.assets.build_background(view_size)
+        self.hud.resize(hud_size or view_size)
+
+    def draw(self, screen):
+        """Render the world and the HUD on one surface"""
+        self.draw_world(screen)
+        self.draw_hud(screen)
+
+    def draw_world(self, screen):
+        """Render the world between the last two simulation steps"""
+        camera = self.camera
+        profiler = self.profiler
+        camera.begin_render(self.clock.alpha, self.clock.steps)
+
+        # World drawing is queued and issued in bulk, layer by layer, at the flush below
+        # Draw static background (no parallax to avoid screen edge issues)
+        render_queue.submit(self.assets.background, (0, 0), LAYER_BACKGROUND, screen_space=True)
+        # Draw darker platforms for contrast (pre-baked chunks in view only)
+        self.tile_layer.draw(screen, camera)
+        profiler.lap('tiles')
+
+        Arrow.draw_motion_blur(screen, camera)  # Shared blur behind every arrow
+        self.player.draw(screen, camera)
+
+        # Draw all enemies - AN ARMY OF ARCHERS!
+        for enemy in self.enemies:
+            if camera.is_visible(enemy.rect, CULL_MARGIN, 'enemies'):
+                # Draw enemy with player reference for bow aiming (its own draw code, run in layer order)
+                render_queue.submit_call(LAYER_ENTITIES, enemy.draw, camera, self.player)
+            else:
+                # Off screen, but its arrows may not be (they cull themselves)
+                for arrow in getattr(enemy, 'arrows', ()):
+                    arrow.draw(screen, camera)
+
+        self.particle_system.draw(screen, camera)  # Draw particles
+        profiler.lap('entities')
+
+        render_queue.flush(screen, camera)
+        profiler.lap('render')
+
+    def draw_hud(self, screen):
+        """Draw the screen-space UI over the world, at the screen's own size"""
+        width, height = screen.get_size()
+        # Draw health bars for first few enemies (not all to avoid clutter)
+        for i, enemy in enumerate(self.enemies[:3]):  # Show health for first 3 enemies
+            enemy.draw_boss_health_bar(screen, width, height + i * 30)
+
+        self.hud.draw(screen)  # Hotbar, health tank and mana bar
+        self.profiler.lap('hud')
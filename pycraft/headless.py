@@ -0,0 +1,125 @@
+# Headless pycraft runner: no window, no audio, simulation steps as fast as the CPU allows.
+# Usage: python headless.py --script volley --steps 3600 --enemies 10
+import os
+
+# Must be set before pygame initializes its video and audio subsystems
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import time
+import pygame
+
+from settings import *
+from game import Game, Assets, InputState
+
+
+class ScriptedKeys:
+    """Stand-in for pygame.key.get_pressed() driven by a set of held keys"""
+    def __init__(self, held=()):
+        self.held = frozenset(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+NO_KEYS = ScriptedKeys()
+
+
+def aim_at(game, world_point):
+    """Return the screen mouse position that points the bow at a world point"""
+    offset_x, offset_y = game.camera.position
+    return (world_point[0] + offset_x, world_point[1] + offset_y)
+
+
+def idle_script(step, game):
+    """Stand still"""
+    return InputState(NO_KEYS)
+
+
+def walk_script(step, game):
+    """Run right, jumping once a second"""
+    return InputState(ScriptedKeys([pygame.K_d]), jump_pressed=step % 60 == 0)
+
+
+def archer_script(step, game):
+    """Charge the bow for half a second and release, aiming ahead and up"""
+    player = game.player.rect
+    target = aim_at(game, (player.centerx + 400, player.centery - 150))
+    return InputState(NO_KEYS, target, right_click=step % 40 < 30)
+
+
+def special_script(step, game):
+    """Fill mana and trigger the special ability (5 s of rapid fire) whenever it ends"""
+    player = game.player
+    if not player.is_special_ability_active:
+        player.mana = player.max_mana
+    keys = ScriptedKeys([pygame.K_s])
+    target = aim_at(game, (player.rect.centerx + 400, player.rect.centery))
+    return InputState(keys, target)
+
+
+def volley_script(step, game, arrows_per_step=7):
+    """Soak test: loose a fan of arrows every step (400+ arrows a second)"""
+    player = game.player
+    bow = game.bow
+    for i in range(arrows_per_step):
+        bow.angle = -0.2 - 0.1 * i
+        arrow = bow.shoot_arrow()
+        if arrow:
+            arrow.particle_system = player.particle_system
+            player.arrows.append(arrow)
+    return InputState(NO_KEYS, aim_at(game, (player.rect.centerx + 400, player.rect.centery)))
+
+
+SCRIPTS = {
+    'idle': idle_script,
+    'walk': walk_script,
+    'archer': archer_script,
+    'special': special_script,
+    'volley': volley_script,
+}
+
+
+def create_game(view_size=(SCREEN_WIDTH, SCREEN_HEIGHT), **game_options):
+    """Build the full game world with rendering and audio disabled"""
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((1, 1))  # Image convert() needs a display format
+    return Game(Assets(view_size), view_size, **game_options)
+
+
+def run(game, script, steps, surface=None):
+    """Step the simulation with scripted input; draw into surface if one is given"""
+    for step in range(steps):
+        game.step(script(step, game))
+        if surface is not None:
+            game.draw(surface)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the pycraft simulation headless")
+    parser.add_argument('--script', choices=sorted(SCRIPTS), default='archer')
+    parser.add_argument('--steps', type=int, default=SIMULATION_RATE * 60)
+    parser.add_argument('--enemies', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--render', action='store_true', help="Also draw every step to an offscreen surface")
+    args = parser.parse_args()
+
+    game = create_game(enemy_count=args.enemies, seed=args.seed)
+    surface = pygame.Surface((game.view_width, game.view_height)) if args.render else None
+
+    start = time.perf_counter()
+    run(game, SCRIPTS[args.script], args.steps, surface)
+    elapsed = time.perf_counter() - start
+
+    simulated = args.steps * game.clock.step
+    print(f"{args.steps} steps ({simulated:.1f} s simulated) in {elapsed:.2f} s - "
+          f"{args.steps / elapsed:.0f} steps/s, {simulated / elapsed:.1f}x real time")
+    print(f"Live: {len(game.player.arrows)} player arrows, {len(game.particle_system)} particles, "
+          f"{len(game.enemies)} enemies")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import math
+from rotation_cache import rotated_mask
+from settings import HITMASK_SAMPLE_SPACING
+
+
+def sprite_mask(entity):
+    """Return (mask, rect) of an entity's sprite as drawn, or None if only its rect is known"""
+    hit_mask = getattr(entity, 'hit_mask', None)
+    if hit_mask is not None:
+        return hit_mask()
+    image = getattr(entity, 'image', None)
+    if image is None:
+        return None
+    mask = rotated_mask(image, 0)
+    return mask, mask.get_rect(center=entity.rect.center)
+
+
+def masks_overlap(mask_a, rect_a, mask_b, rect_b):
+    """True if two placed masks share a set pixel"""
+    return mask_a.overlap(mask_b, (rect_b.x - rect_a.x, rect_b.y - rect_a.y)) is not None
+
+
+def entities_touch(entity_a, entity_b):
+    """Pixel-accurate contact test, for entities whose rects already overlap"""
+    sprite_a = sprite_mask(entity_a)
+    sprite_b = sprite_mask(entity_b)
+    if sprite_a is None or sprite_b is None:
+        return True  # Nothing finer than the rect test to go on
+    return masks_overlap(*sprite_a, *sprite_b)
+
+
+def arrow_hit_time(arrow, target, start_time):
+    """Refine a swept rect hit: the first point along the arrow's path from start_time where
+    its rotated sprite overlaps the target's sprite, or None if it only grazed the hitbox"""
+    sprite = sprite_mask(target)
+    if sprite is None:
+        return start_time
+    target_mask, target_rect = sprite
+    arrow_mask = rotated_mask(arrow.image, -math.degrees(arrow.angle))
+    (x0, y0), (x1, y1) = arrow.prev_center, arrow.center
+    length = math.hypot(x1 - x0, y1 - y0) * (1 - start_time)
+    samples = max(1, math.ceil(length / HITMASK_SAMPLE_SPACING))
+    for i in range(samples + 1):
+        t = start_time + (1 - start_time) * i / samples
+        arrow_rect = arrow_mask.get_rect(center=(x0 + (x1 - x0) * t, y0 + (y1 - y0) * t))
+        if masks_overlap(arrow_mask, arrow_rect, target_mask, target_rect):
+            return t
+    return None
@@ -1,5 +1,6 @@
 import pygame
 from settings import *
+from hud import glyph_cache
 
 class Hotbar:
     """Hotbar UI system for item management"""
@@ -13,6 +14,12 @@ class Hotbar:
             slot_x = HOTBAR_X + i * (HOTBAR_SLOT_SIZE + HOTBAR_PADDING)
             rect = pygame.Rect(slot_x, HOTBAR_Y, HOTBAR_SLOT_SIZE, HOTBAR_SLOT_SIZE)
             self.slot_rects.append(rect)
+
+        # Translucent background, built once
+        self.background = pygame.Surface((HOTBAR_SLOTS * (HOTBAR_SLOT_SIZE + HOTBAR_PADDING) + HOTBAR_PADDING,
+                                          HOTBAR_SLOT_SIZE + HOTBAR_PADDING * 2), pygame.SRCALPHA)
+        self.background.fill(HOTBAR_BACKGROUND_COLOR)
+        self.rect = self.background.get_rect(topleft=(HOTBAR_X - HOTBAR_PADDING, HOTBAR_Y - HOTBAR_PADDING))
     
     def add_item(self, item, slot=None):
         """Add an item to a specific slot or first empty slot"""
@@ -61,16 +68,14 @@ class Hotbar:
         self.select_slot(new_slot)
         return True
     
+    def state(self):
+        """Everything the hotbar's look depends on, for the HUD to detect changes"""
+        return (self.selected_slot, tuple(map(id, self.slots)))
+
     def draw(self, screen):
         """Draw the hotbar on screen"""
-        # Create surface with alpha for transparency (horizontal layout)
-        hotbar_surface = pygame.Surface((HOTBAR_SLOTS * (HOTBAR_SLOT_SIZE + HOTBAR_PADDING) + HOTBAR_PADDING, 
-                                        HOTBAR_SLOT_SIZE + HOTBAR_PADDING * 2), 
-                                       pygame.SRCALPHA)
-        hotbar_surface.fill(HOTBAR_BACKGROUND_COLOR)
-        
         # Draw background
-        screen.blit(hotbar_surface, (HOTBAR_X - HOTBAR_PADDING, HOTBAR_Y - HOTBAR_PADDING))
+        screen.blit(self.background, self.rect)
         
         # Draw slots
         for i, rect in enumerate(self.slot_rects):
@@ -92,7 +97,6 @@ class Hotbar:
                 item.draw_icon(screen, rect.x + 4, rect.y + 4, HOTBAR_SLOT_SIZE - 8)
             
             # Draw slot number
-            font = pygame.font.Font(None, 20)
             if i < 9:
                 text = str(i + 1)
             elif i == 9:
@@ -102,5 +106,5 @@ class Hotbar:
             else:  # i == 11
                 text = "="
                 
-            text_surface = font.render(text, True, (200, 200, 200))
-            screen.blit(text_surface, (rect.x + 2, rect.y + 2))
\ No newline at end of file
+            text_surface = glyph_cache.text(text, 20, (200, 200, 200))
+            screen.blit(text_surface, (rect.x + 2, rect.y + 2))
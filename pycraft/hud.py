@@ -0,0 +1,107 @@
+import pygame
+from collections import OrderedDict
+from surface_cache import SurfaceCache
+from settings import GLYPH_CACHE_SIZE, GLYPH_ICON_MAX_BYTES
+
+
+class GlyphCache:
+    """Fonts, rendered text and scaled icons shared by all UI code, each built once"""
+    def __init__(self, max_text=GLYPH_CACHE_SIZE, max_icon_bytes=GLYPH_ICON_MAX_BYTES):
+        self.fonts = {}  # size -> Font
+        self.texts = OrderedDict()  # (text, size, color) -> Surface, least recently used first
+        self.max_text = max_text
+        self.icons = SurfaceCache(max_icon_bytes)  # Scaled item icons
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size):
+        """The default font at a size"""
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def text(self, text, size, color):
+        """Rendered antialiased text (shared, do not modify)"""
+        key = (text, size, color)
+        surface = self.texts.get(key)
+        if surface is not None:
+            self.texts.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.texts[key] = self.font(size).render(text, True, color)
+        if len(self.texts) > self.max_text:
+            self.texts.popitem(last=False)
+        return surface
+
+    def icon(self, image, size):
+        """image scaled to a size x size icon (shared, do not modify)"""
+        return self.icons.get(image, (size,), lambda: pygame.transform.scale(image, (size, size)))
+
+
+# Shared by the HUD widgets, hotbar and items
+glyph_cache = GlyphCache()
+
+
+def every_frame():
+    """State function for widgets that can't report their state: never equal, so redrawn every frame"""
+    return object()
+
+
+class Hud:
+    """Screen-space UI composited into one cached layer.
+
+    Each widget owns a screen rect, a state function and a draw function that paints at screen
+    coordinates. Only widgets whose state changed since the last frame are cleared and redrawn
+    (clipped to their rect). The layer reaches only as far as the widgets (it starts at the screen
+    origin, so widgets keep their coordinates) and just the union of their rects is blitted: an
+    unchanged HUD costs one small blit, not a full-screen alpha blend.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.surface = None  # Built on the next draw, once the widgets are known
+        self.bounds = None  # Union of the widget rects, on screen
+        self.widgets = []  # [rect, state function, draw function, last state]
+        self.redraws = 0  # Widgets redrawn on the last frame
+
+    def resize(self, size):
+        """New screen size; the layer is rebuilt and every widget redrawn on the next frame"""
+        self.size = size
+        self.surface = None
+
+    def add(self, rect, state, draw):
+        """Register a widget; draw(surface) is called whenever state() returns something new"""
+        self.widgets.append([pygame.Rect(rect), state, draw, None])
+        self.surface = None
+
+    def build(self):
+        """Size the layer to the widgets and mark them all for redrawing"""
+        rects = [widget[0] for widget in self.widgets]
+        self.bounds = rects[0].unionall(rects[1:]).clip(pygame.Rect((0, 0), self.size))
+        self.surface = pygame.Surface(self.bounds.bottomright, pygame.SRCALPHA)
+        for widget in self.widgets:
+            widget[3] = None
+
+    def draw(self, screen):
+        """Refresh changed widgets, then blit the area they cover"""
+        self.redraws = 0
+        if not self.widgets:
+            return
+        if self.surface is None:
+            self.build()
+        if not self.bounds:
+            return
+        surface = self.surface
+        for widget in self.widgets:
+            rect, state, draw, last_state = widget
+            current = state()
+            if current == last_state:
+                continue
+            widget[3] = current
+            surface.set_clip(rect)
+            surface.fill((0, 0, 0, 0), rect)
+            draw(surface)
+            self.redraws += 1
+        surface.set_clip(None)
+        screen.blit(surface, self.bounds.topleft, self.bounds)
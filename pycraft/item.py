@@ -1,4 +1,4 @@
-import pygame
+from hud import glyph_cache
 
 class Item:
     """Base class for all items"""
@@ -14,8 +14,7 @@ class Item:
     def draw_icon(self, screen, x, y, size):
         """Draw the item icon on screen"""
         if self.image:
-            scaled_image = pygame.transform.scale(self.image, (size, size))
-            screen.blit(scaled_image, (x, y))
+            screen.blit(glyph_cache.icon(self.image, size), (x, y))
 
 class WeaponItem(Item):
     """Base class for weapon items"""
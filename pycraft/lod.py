@@ -0,0 +1,76 @@
+from settings import (LOD_FULL_MARGIN, LOD_SLEEP_MARGIN, LOD_REDUCED_INTERVAL, LOD_CATCHUP_STEPS,
+                      LOD_MAX_DEBT)
+
+# Simulation tiers, nearest first
+LOD_FULL = 0  # Every step, with cosmetic effects
+LOD_REDUCED = 1  # One step in LOD_REDUCED_INTERVAL, no cosmetic effects
+LOD_SLEEP = 2  # Not simulated at all
+LOD_TIER_NAMES = ('full', 'reduced', 'asleep')
+
+
+class SimulationLOD:
+    """Simulation tiers by distance outside the camera view.
+
+    The full tier covers the whole view plus full_margin, so anything on screen runs every step;
+    reduced and sleeping entities are always off screen. The areas follow the view's size, so
+    they hold at any resolution or zoom. Every entity carries a debt of world steps it has not been simulated for. Reduced and
+    sleeping entities build it up; once back in the full tier an entity replays it a few
+    extra steps at a time, so it catches up to the world clock exactly without a frame spike
+    (a debt past max_debt, i.e. a very long sleep, is forgotten like a stalled SimClock frame).
+    """
+    def __init__(self, full_margin=LOD_FULL_MARGIN, sleep_margin=LOD_SLEEP_MARGIN,
+                 reduced_interval=LOD_REDUCED_INTERVAL, catchup=LOD_CATCHUP_STEPS, max_debt=LOD_MAX_DEBT):
+        self.full_margin = full_margin
+        self.sleep_margin = sleep_margin
+        self.reduced_interval = reduced_interval
+        self.catchup = catchup  # Extra owed steps replayed per world step
+        self.max_debt = max_debt
+        self.steps = 0
+        self.debt = {}  # Entity -> steps owed
+        self.counts = [0, 0, 0]  # Entities per tier on the last plan
+        self.updates = 0  # Entity updates run on the last plan
+
+    @staticmethod
+    def tier(rect, full_area, reduced_area):
+        """Simulation tier of a world rect: full if it touches full_area, reduced if reduced_area"""
+        if full_area.colliderect(rect):
+            return LOD_FULL
+        if reduced_area.colliderect(rect):
+            return LOD_REDUCED
+        return LOD_SLEEP
+
+    def plan(self, entities, camera):
+        """Return (entity, steps to run, tier) for every entity due an update this world step"""
+        full_area = camera.simulated_rect(self.full_margin)
+        reduced_area = camera.simulated_rect(self.sleep_margin)
+        self.steps += 1
+        interval = self.reduced_interval
+        debt = self.debt
+        self.debt = owed_after = {}  # Rebuilt every step, so removed entities drop out
+        counts = [0, 0, 0]
+        due = []
+        for index, entity in enumerate(entities):
+            owed = debt.get(entity, 0) + 1
+            tier = self.tier(entity.rect, full_area, reduced_area)
+            counts[tier] += 1
+            if tier == LOD_FULL:
+                steps = min(owed, 1 + self.catchup)
+            elif tier == LOD_REDUCED and (self.steps + index) % interval == 0:
+                steps = 1  # Staggered by index so reduced updates spread evenly across steps
+            else:
+                steps = 0
+            owed -= steps
+            if owed:
+                owed_after[entity] = min(owed, self.max_debt)
+            if steps:
+                due.append((entity, steps, tier))
+        self.counts = counts
+        self.updates = sum(steps for _, steps, _ in due)
+        return due
+
+    def stats(self):
+        """Entities per tier, updates run and total steps owed, for the profiler overlay"""
+        stats = dict(zip(LOD_TIER_NAMES, self.counts))
+        stats['updates'] = self.updates
+        stats['owed'] = sum(self.debt.values())
+        return stats
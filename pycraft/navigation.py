@@ -0,0 +1,249 @@
+import heapq
+import math
+from collections import OrderedDict
+
+import numpy as np
+from settings import (PLAYER_HEIGHT, PLAYER_MAX_SPEED, JUMP_STRENGTH, GRAVITY, NAV_AREA_SIZE,
+                      NAV_ROUTE_CACHE_SIZE, NAV_JUMP_COST)
+
+
+class NavGraph:
+    """Walkable surfaces of a level and the walk, jump and drop links between them, built once.
+
+    A node is an empty cell an entity can stand in (solid cell below, headroom above), numbered
+    row * cols + col. Paths are found with A* and kept as per-area route tables: every path found
+    towards an area is stored as next hops, and later searches towards the same area stop as soon
+    as they reach a node already routed - so enemies chasing the same target share their searches.
+    """
+    def __init__(self, world, body_height=PLAYER_HEIGHT, speed=PLAYER_MAX_SPEED,
+                 jump_strength=JUMP_STRENGTH, gravity=GRAVITY):
+        self.world = world
+        self.tile_size = size = world.tile_size
+        self.cols = world.cols
+        self.body_height = body_height
+        self.speed = speed
+        self.jump_strength = jump_strength
+        self.gravity = gravity
+        self.clearance = max(1, math.ceil(body_height / size))  # Empty cells a standing body needs
+        self.jump_rows = int(jump_strength * jump_strength / (2 * gravity) // size)  # Highest ledge reachable
+
+        # Standable cells in bulk: empty, solid below, and headroom above
+        solid = world.array != 0
+        standable = np.zeros_like(solid)
+        standable[:-1] = ~solid[:-1] & solid[1:]
+        for above in range(1, self.clearance):
+            standable[above:] &= ~solid[:-above]
+            standable[:above] = False
+        self.standable = standable
+        rows, cols = np.nonzero(standable)
+        self.nodes = (rows * self.cols + cols).tolist()
+
+        self.links = {node: [] for node in self.nodes}  # Node -> [(neighbor, cost)]
+        self.link_count = 0
+        for node in self.nodes:
+            self.link_node(node)
+
+        # Route tables per goal area, least recently used first
+        self.routes = OrderedDict()  # area -> NavRoute
+        self.searches = 0
+        self.reused = 0
+
+    # --- Building ---
+
+    def node_point(self, node):
+        """World point an entity standing on a node has its feet at (bottom center)"""
+        row, col = divmod(node, self.cols)
+        size = self.tile_size
+        return (col * size + size / 2, (row + 1) * size)
+
+    def is_node(self, col, row):
+        """True if (col, row) is inside the grid and standable"""
+        return 0 <= col < self.cols and 0 <= row < self.world.rows and bool(self.standable[row, col])
+
+    def landing_time(self, rise, launch_speed):
+        """Steps until a body launched upward at launch_speed comes down through rise pixels above
+        (negative rise = below) its start, or None if it never gets that high"""
+        discriminant = launch_speed * launch_speed - 2 * self.gravity * rise
+        if discriminant < 0:
+            return None
+        return (launch_speed + math.sqrt(discriminant)) / self.gravity
+
+    def link(self, node, target, cost):
+        self.links[node].append((target, cost))
+        self.link_count += 1
+
+    def link_node(self, node):
+        """Add every walk, jump and drop link leaving a node"""
+        row, col = divmod(node, self.cols)
+        size = self.tile_size
+        # Walk to the neighbors on the same surface
+        for dc in (-1, 1):
+            if self.is_node(col + dc, row):
+                self.link(node, node + dc, 1.0)
+
+        # Jump to ledges within the arc: up to jump_rows higher, or across gaps and down.
+        # Shorter hops (apex just over the higher surface) are tried where a full jump hits a ceiling
+        for dr in range(-self.jump_rows, self.jump_rows + 1):
+            rise = -dr * size
+            linked = set()
+            hops = [math.sqrt(2 * self.gravity * (max(rise, 0) + margin)) for margin in (size / 2, size / 8)]
+            for launch in [-self.jump_strength] + hops:
+                airtime = self.landing_time(rise, launch)
+                if airtime is None:
+                    continue
+                reach = int(self.speed * airtime // size)
+                for dc in range(-reach, reach + 1):
+                    if dc in linked or (dr == 0 and abs(dc) <= 1) or not self.is_node(col + dc, row + dr):
+                        continue
+                    if self.arc_clear(node, dc, dr, launch, airtime):
+                        self.link(node, (row + dr) * self.cols + col + dc, abs(dc) + abs(dr) + NAV_JUMP_COST)
+                        linked.add(dc)
+
+        # Drop off the surface edges, straight down beside them to whatever is below
+        for dc in (-1, 1):
+            side = col + dc
+            if not 0 <= side < self.cols or self.is_node(side, row) or self.world.is_solid(side, row):
+                continue
+            for below in range(row + 1, self.world.rows):
+                if self.world.is_solid(side, below):
+                    break
+                if self.is_node(side, below):
+                    self.link(node, below * self.cols + side, 1 + (below - row))
+                    break
+
+    def arc_clear(self, node, dc, dr, launch, airtime):
+        """True if a jump from node at launch speed, landing dc, dr cells away, has a clear path for the body"""
+        x0, y0 = self.node_point(node)
+        size = self.tile_size
+        vel_x = dc * size / airtime
+        samples = max(2, int(airtime // 3))
+        for i in range(1, samples):
+            t = airtime * i / samples
+            x = x0 + vel_x * t
+            y = y0 - launch * t + self.gravity * t * t / 2
+            col = int(x // size)
+            # Feet and head cells
+            if self.world.is_solid(col, int((y - 1) // size)) or \
+                    self.world.is_solid(col, int((y - self.body_height) // size)):
+                return False
+        return True
+
+    # --- Queries ---
+
+    def node_at(self, point):
+        """The node under a world point (e.g. an entity's feet): its own cell, or the first surface below it"""
+        col, row = self.world.cell_at(point[0], point[1] - 1)
+        if not 0 <= col < self.cols:
+            return None
+        for row in range(max(row, 0), self.world.rows):
+            if self.standable[row, col]:
+                return row * self.cols + col
+            if self.world.is_solid(col, row):
+                return None
+        return None
+
+    def spawn_points(self, height=PLAYER_HEIGHT):
+        """Top-left positions for an entity of the given height standing on every node"""
+        size = self.tile_size
+        return [((node % self.cols) * size, (node // self.cols + 1) * size - height) for node in self.nodes]
+
+    def area(self, node):
+        """Goal area a node belongs to: routes are shared by every goal in one area"""
+        row, col = divmod(node, self.cols)
+        return (col // NAV_AREA_SIZE, row // NAV_AREA_SIZE)
+
+    def route(self, area, goal):
+        """The route table towards an area, created around goal if new"""
+        route = self.routes.get(area)
+        if route is None:
+            route = self.routes[area] = NavRoute(goal)
+            if len(self.routes) > NAV_ROUTE_CACHE_SIZE:
+                self.routes.popitem(last=False)
+        else:
+            self.routes.move_to_end(area)
+        return route
+
+    def find_path(self, start_point, goal_point):
+        """Node path from the surface under start_point towards goal_point's area, or None.
+
+        Paths lead to the area's route goal (the first goal asked for there), which is within
+        NAV_AREA_SIZE tiles of goal_point; the last stretch is for the caller to steer directly.
+        """
+        start = self.node_at(start_point)
+        goal = self.node_at(goal_point)
+        if start is None or goal is None:
+            return None
+        route = self.route(self.area(goal), goal)
+        if start in route.dead:
+            return None
+        if start not in route.next_hop:
+            self.searches += 1
+            if not self.search(start, route):
+                return None
+        else:
+            self.reused += 1
+        return route.path_from(start)
+
+    def next_waypoint(self, start_point, goal_point):
+        """World point (feet) of the next node to head for, or None if there is no known way"""
+        path = self.find_path(start_point, goal_point)
+        if not path:
+            return None
+        return self.node_point(path[1] if len(path) > 1 else path[0])
+
+    def search(self, start, route):
+        """A* from start until it reaches the route's goal or any node already routed to it"""
+        goal_row, goal_col = divmod(route.goal, self.cols)
+        cols = self.cols
+        next_hop = route.next_hop
+
+        def estimate(node):
+            row, col = divmod(node, cols)
+            return abs(col - goal_col) + abs(row - goal_row)
+
+        came_from = {start: None}
+        cost = {start: 0.0}
+        frontier = [(estimate(start), start)]
+        while frontier:
+            _, node = heapq.heappop(frontier)
+            if node in next_hop:
+                # Joined a known route (or reached the goal): record the new branch
+                previous = came_from[node]
+                while previous is not None:
+                    next_hop[previous] = node
+                    node, previous = previous, came_from[previous]
+                return True
+            for neighbor, step_cost in self.links[node]:
+                new_cost = cost[node] + step_cost
+                if new_cost < cost.get(neighbor, math.inf):
+                    cost[neighbor] = new_cost
+                    came_from[neighbor] = node
+                    heapq.heappush(frontier, (new_cost + estimate(neighbor), neighbor))
+        # Everything reachable from start was searched: none of it leads to this goal
+        route.dead.update(came_from)
+        return False
+
+    def stats(self):
+        """Graph size and path cache use, for the profiler overlay"""
+        return {
+            'nodes': len(self.nodes),
+            'links': self.link_count,
+            'routes': len(self.routes),
+            'searches': self.searches,
+            'reused': self.reused,
+        }
+
+
+class NavRoute:
+    """Next hops towards one goal node, shared by every path found to its area"""
+    def __init__(self, goal):
+        self.goal = goal
+        self.next_hop = {goal: None}
+        self.dead = set()  # Nodes known not to reach the goal
+
+    def path_from(self, node):
+        path = []
+        while node is not None:
+            path.append(node)
+            node = self.next_hop[node]
+        return path
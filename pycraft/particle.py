@@ -1,126 +1,215 @@
 import pygame
-import math
-import random
+import numpy as np
 from settings import *
+from render_queue import render_queue, LAYER_PARTICLES
+from quality import quality
+
+# Per-particle fields, stored as one preallocated array each
+PARTICLE_FIELDS = {
+    'x': np.float32,
+    'y': np.float32,
+    'vel_x': np.float32,
+    'vel_y': np.float32,
+    'lifetime': np.float32,
+    'max_lifetime': np.float32,
+    'color': np.int16,  # Index into the palette
+    'damage': np.float32,
+    'can_damage': np.bool_,  # Whether this particle can damage the player
+    'has_hit_player': np.bool_,  # Each particle only hits the player once
+}
+
+
+class ParticleAtlas:
+    """Pre-rendered particle dots for every (color, radius, alpha bucket) combination"""
+    def __init__(self, max_radius=PARTICLE_SIZE, alpha_buckets=PARTICLE_ALPHA_BUCKETS):
+        self.max_radius = max_radius
+        self.alpha_buckets = alpha_buckets
+        self.sprites = []  # Flat list, see sprite_index
+
+    def add_color(self, color):
+        """Render every radius and alpha bucket for a newly registered palette color"""
+        for radius in range(1, self.max_radius + 1):
+            for bucket in range(self.alpha_buckets):
+                alpha = round((bucket + 1) * 255 / self.alpha_buckets)
+                sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                pygame.draw.circle(sprite, (*color, alpha), (radius, radius), radius)
+                self.sprites.append(sprite)
+
+    def sprite_index(self, colors, radii, alphas):
+        """Map per-particle color indices, radii (1..max) and alphas (1..255) to sprite indices"""
+        buckets = np.minimum(alphas * self.alpha_buckets // 256, self.alpha_buckets - 1)
+        return (colors.astype(np.int32) * self.max_radius + (radii - 1)) * self.alpha_buckets + buckets
+
+
+class ParticleSystem:
+    """Manages particles as a structure of NumPy arrays, updated in bulk"""
+    def __init__(self, clock, capacity=PARTICLE_CAPACITY, seed=None):
+        self.clock = clock
+        self.count = 0  # Live particles occupy the first `count` slots
+        self.capacity = 0
+        self.palette = []  # Color index -> RGB
+        self.color_indices = {}  # RGB -> color index
+        self.rng = np.random.default_rng(seed)
+        self.atlas = ParticleAtlas()
+        self.hit_mask = pygame.mask.Mask((PARTICLE_SIZE * 2, PARTICLE_SIZE * 2), fill=True)
+        self.effects_area = None  # World rect cosmetic bursts are limited to (None: anywhere)
+        self.allocate(capacity)
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return True  # Still a particle system when empty (callers test `if particle_system:`)
+
+    def allocate(self, capacity):
+        """(Re)allocate every field array, keeping live particles"""
+        for name, dtype in PARTICLE_FIELDS.items():
+            array = np.zeros(capacity, dtype)
+            if self.capacity:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def color_index(self, color):
+        """Return the palette index for an RGB color, registering it if new"""
+        color = tuple(color[:3])
+        index = self.color_indices.get(color)
+        if index is None:
+            index = len(self.palette)
+            self.palette.append(color)
+            self.color_indices[color] = index
+            self.atlas.add_color(color)
+        return index
+
+    def create_explosion(self, x, y, color, count=PARTICLE_COUNT, can_damage=False, damage=5):
+        """Create an explosion of particles at the given position"""
+        if not can_damage:
+            # Cosmetic bursts follow the quality budget; damaging particles are gameplay
+            if self.effects_area is not None and not self.effects_area.collidepoint(x, y):
+                return
+            count = quality.particle_count(count)
+        if count <= 0:
+            return
+        if self.count + count > self.capacity:
+            self.allocate(max(self.capacity * 2, self.count + count))
+
+        start = self.count
+        end = start + count
+        # Random direction and speed
+        angle = self.rng.uniform(0, 2 * np.pi, count)
+        speed = self.rng.uniform(PARTICLE_SPEED_MIN, PARTICLE_SPEED_MAX, count)
+        # Add some randomness to lifetime
+        lifetime = PARTICLE_LIFETIME + self.rng.uniform(-0.2, 0.2, count)
+
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vel_x[start:end] = np.cos(angle) * speed
+        self.vel_y[start:end] = np.sin(angle) * speed
+        self.lifetime[start:end] = lifetime
+        self.max_lifetime[start:end] = lifetime
+        self.color[start:end] = self.color_index(color)
+        self.damage[start:end] = damage
+        self.can_damage[start:end] = can_damage
+        self.has_hit_player[start:end] = False
+        self.count = end
 
-class Particle:
-    """Individual particle for explosion effects"""
-    def __init__(self, x, y, vel_x, vel_y, color, lifetime, can_damage=False, damage=5):
-        self.x = x
-        self.y = y
-        self.vel_x = vel_x
-        self.vel_y = vel_y
-        self.color = color
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.alive = True
-        self.size = PARTICLE_SIZE
-        self.can_damage = can_damage  # Whether this particle can damage the player
-        self.damage = damage  # How much damage it deals
-        self.has_hit_player = False  # Track if this particle already hit the player
-        
     def update(self):
-        """Update particle physics"""
-        if not self.alive:
+        """Integrate all particles and drop the dead ones"""
+        n = self.count
+        if not n:
             return
-            
+
         # Update position
-        self.x += self.vel_x
-        self.y += self.vel_y
-        
+        self.x[:n] += self.vel_x[:n]
+        self.y[:n] += self.vel_y[:n]
+
         # Apply gravity and air resistance
-        self.vel_y += 0.2  # Gravity
-        self.vel_x *= 0.98  # Air resistance
-        self.vel_y *= 0.98
-        
+        self.vel_y[:n] += PARTICLE_GRAVITY
+        self.vel_x[:n] *= PARTICLE_DRAG
+        self.vel_y[:n] *= PARTICLE_DRAG
+
         # Update lifetime
-        self.lifetime -= 1/60  # Assuming 60 FPS
-        if self.lifetime <= 0:
-            self.alive = False
-    
-    def check_collision(self, player_rect):
-        """Check if particle collides with player"""
-        if not self.alive or not self.can_damage or self.has_hit_player:
-            return False
-            
-        # Create particle hitbox
-        particle_rect = pygame.Rect(
-            self.x - self.size, self.y - self.size, 
-            self.size * 2, self.size * 2
-        )
-        
-        # Check collision with player
-        if particle_rect.colliderect(player_rect):
-            self.has_hit_player = True  # Mark as hit so it doesn't hit again
-            return True
-        return False
-            
+        self.lifetime[:n] -= self.clock.step
+
+        # Remove dead particles by compacting the survivors to the front
+        alive = self.lifetime[:n] > 0
+        survivors = int(np.count_nonzero(alive))
+        if survivors < n:
+            for name in PARTICLE_FIELDS:
+                array = getattr(self, name)
+                array[:survivors] = array[:n][alive]
+            self.count = survivors
+
+    def check_player_collisions(self, player_rect, player_sprite=None):
+        """Check if any particles hit the player and return damage dealt.
+
+        player_sprite is an optional (mask, rect) of the player as drawn: particles whose
+        boxes touch player_rect must also touch a set pixel of it.
+        """
+        n = self.count
+        if not n:
+            return 0
+        candidates = self.can_damage[:n] & ~self.has_hit_player[:n]
+        if not candidates.any():
+            return 0
+
+        # Particle hitboxes are squares of PARTICLE_SIZE around each center
+        x = self.x[:n]
+        y = self.y[:n]
+        size = PARTICLE_SIZE
+        hits = (candidates
+                & (x - size < player_rect.right) & (x + size > player_rect.left)
+                & (y - size < player_rect.bottom) & (y + size > player_rect.top))
+        if not hits.any():
+            return 0
+
+        if player_sprite is not None:
+            # Pixel test only for the few particles already inside the rect
+            mask, mask_rect = player_sprite
+            hit_mask = self.hit_mask
+            for i in np.flatnonzero(hits).tolist():
+                offset = (int(x[i]) - size - mask_rect.x, int(y[i]) - size - mask_rect.y)
+                if mask.overlap(hit_mask, offset) is None:
+                    hits[i] = False
+            if not hits.any():
+                return 0
+
+        self.has_hit_player[:n] |= hits  # Mark as hit so they don't hit again
+        return float(self.damage[:n][hits].sum())
+
     def draw(self, screen, camera):
-        """Draw the particle"""
-        if not self.alive:
+        """Draw all particles with a single batched blit from the sprite atlas"""
+        n = self.count
+        if not n:
             return
-            
-        # Calculate alpha based on remaining lifetime
-        alpha_factor = self.lifetime / self.max_lifetime
-        alpha = int(255 * alpha_factor)
-        
-        # Calculate size based on lifetime (shrinks over time)
-        current_size = int(self.size * alpha_factor)
-        if current_size < 1:
-            current_size = 1
-            
-        # Apply camera transform
-        screen_pos = camera.apply_point((self.x, self.y))
-        
-        # Draw particle as a small circle
-        if alpha > 0:
-            color_with_alpha = (*self.color, alpha)
-            # Create a small surface for the particle
-            particle_surface = pygame.Surface((current_size * 2, current_size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(particle_surface, color_with_alpha, (current_size, current_size), current_size)
-            screen.blit(particle_surface, (screen_pos[0] - current_size, screen_pos[1] - current_size))
 
-class ParticleSystem:
-    """Manages multiple particles"""
-    def __init__(self):
-        self.particles = []
-        
-    def create_explosion(self, x, y, color, count=PARTICLE_COUNT, can_damage=False, damage=5):
-        """Create an explosion of particles at the given position"""
-        for _ in range(count):
-            # Random direction
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(PARTICLE_SPEED_MIN, PARTICLE_SPEED_MAX)
-            
-            # Calculate velocity
-            vel_x = math.cos(angle) * speed
-            vel_y = math.sin(angle) * speed
-            
-            # Add some randomness to lifetime
-            lifetime = PARTICLE_LIFETIME + random.uniform(-0.2, 0.2)
-            
-            # Create particle (with damage capability if specified)
-            particle = Particle(x, y, vel_x, vel_y, color, lifetime, can_damage, damage)
-            self.particles.append(particle)
-            
-    def update(self):
-        """Update all particles"""
-        # Update particles
-        for particle in self.particles:
-            particle.update()
-            
-        # Remove dead particles
-        self.particles = [p for p in self.particles if p.alive]
-        
-    def check_player_collisions(self, player_rect):
-        """Check if any particles hit the player and return damage dealt"""
-        total_damage = 0
-        for particle in self.particles:
-            if particle.check_collision(player_rect):
-                total_damage += particle.damage
-        return total_damage
-    
-    def draw(self, screen, camera):
-        """Draw all particles"""
-        for particle in self.particles:
-            particle.draw(screen, camera)
\ No newline at end of file
+        # Fade and shrink based on remaining lifetime
+        alpha_factor = self.lifetime[:n] / self.max_lifetime[:n]
+        alphas = (255 * alpha_factor).astype(np.int32)
+        visible = alphas > 0
+        if not visible.all():
+            alpha_factor = alpha_factor[visible]
+            alphas = alphas[visible]
+        radii = np.clip((PARTICLE_SIZE * alpha_factor).astype(np.int32), 1, PARTICLE_SIZE)
+        sprite_indices = self.atlas.sprite_index(self.color[:n][visible], radii, alphas)
+
+        # Camera offset applied to the whole batch, centered on each particle
+        offset_x, offset_y = camera.camera.topleft
+        screen_x = (self.x[:n][visible] + offset_x).astype(np.int32) - radii
+        screen_y = (self.y[:n][visible] + offset_y).astype(np.int32) - radii
+
+        # Cull everything outside the view
+        on_screen = ((screen_x + radii * 2 > 0) & (screen_x < camera.width)
+                     & (screen_y + radii * 2 > 0) & (screen_y < camera.height))
+        drawn = int(np.count_nonzero(on_screen))
+        camera.count('particles', drawn, n - drawn)
+        if drawn < on_screen.size:
+            sprite_indices = sprite_indices[on_screen]
+            screen_x = screen_x[on_screen]
+            screen_y = screen_y[on_screen]
+
+        sprites = self.atlas.sprites
+        render_queue.submit_many(
+            [(sprites[k], (px, py)) for k, px, py in zip(sprite_indices.tolist(), screen_x.tolist(), screen_y.tolist())],
+            LAYER_PARTICLES, screen_space=True,
+        )
@@ -1,16 +1,25 @@
 import pygame
 import math
-import time
 from settings import *
 from hotbar import Hotbar
 from trail import Trail
+from blur import MotionBlur
+from rotation_cache import rotate, rotated_mask
+from tint_cache import tint
+from hud import glyph_cache
+from render_queue import render_queue, LAYER_ENTITIES, LAYER_TRAILS
+from hitmask import entities_touch
+from arrow import arrow_pool
+from projectiles import projectiles
 
 class Player:
     """Represents the player character."""
-    def __init__(self, x, y, image, bow):
+    def __init__(self, x, y, image, bow, clock):
+        self.clock = clock  # Shared simulation clock
         self.original_image = image
         self.image = image
         self.rect = self.image.get_rect(topleft=(x, y))
+        self.prev_center = self.rect.center  # Last step's position, for render interpolation
         self.vel_x = 0
         self.vel_y = 0
         self.acc_x = 0
@@ -21,13 +30,15 @@ class Player:
         # Initialize arrow list for tracking
         self.arrows = []
         
-        # ENHANCED MOTION BLUR SYSTEM for player (walking + dashing)
-        self.motion_blur_copies = []  # List to store multiple player positions
-        self.max_blur_copies = 120  # Optimized for walking + dashing blur
-        self.blur_alpha_decay = 0.88  # Faster fade for cleaner trails
+        # MOTION BLUR for player (walking + dashing) - one accumulation buffer
+        self.motion_blur = MotionBlur(PLAYER_BLUR_DECAY, PLAYER_BLUR_ALPHA)
+        self.blur_alpha = 0  # Strength of this frame's blur stamp (0 = none)
         
         # Initialize health bar
-        from health_bar import HealthBar
+        try:
+            from health_bar import HealthBar
+        except ImportError:  # Not in every checkout (e.g. a CI box): use the minimal stand-in
+            from stand_ins import HealthBar
         self.health_bar = HealthBar(max_health=1000)  # 10x more HP
         self.spawn_x = x
         self.spawn_y = y
@@ -52,14 +63,14 @@ class Player:
         
         # Particle system
         from particle import ParticleSystem
-        self.particle_system = ParticleSystem()
+        self.particle_system = ParticleSystem(clock)
         
         # Dash system
         self.is_dashing = False
         self.dash_start_time = 0
         self.dash_direction_x = 0
         self.dash_direction_y = 0
-        self.dash_cooldown_start = 0
+        self.dash_cooldown_start = -DASH_COOLDOWN  # Dash is ready at start
         self.dash_trail = Trail(DASH_TRAIL_COLOR, max_length=DASH_TRAIL_LENGTH)
         self.dash_speed = 0  # Current dash speed
         self.dash_roll_angle = 0  # Roll animation angle
@@ -84,12 +95,15 @@ class Player:
 
     def reset(self):
         self.rect.topleft = (self.spawn_x, self.spawn_y)
+        self.prev_center = self.rect.center
         self.vel_x = 0
         self.vel_y = 0
         self.angle = 0
         self.on_ground = False
         self.jumps_left = 2
         self.bow.reset()
+        for arrow in self.arrows:
+            arrow_pool.release(arrow)
         self.arrows.clear()
         self.right_click_held = False
         self.right_click_released = False
@@ -98,27 +112,31 @@ class Player:
         self.current_weapon = None
         self.is_dashing = False
         self.dash_start_time = 0
-        self.dash_cooldown_start = 0
+        self.dash_cooldown_start = -DASH_COOLDOWN
         self.dash_trail.clear()
         self.dash_speed = 0
+        self.motion_blur.clear()
         
         # Reset health tank
         self.health_bar.reset()
 
-    def update(self, platforms, jump_pressed, left_click, camera, jump_key_released, right_click, keys_pressed=None, mouse_pos=None, dash_pressed=False):
-        """Handles player movement, gravity, and collision."""
+    def update(self, world, jump_pressed, left_click, camera, jump_key_released, right_click, keys_pressed=None, mouse_pos=None, dash_pressed=False):
+        """Handles player movement, gravity, and collision (one simulation step)."""
+        self.prev_center = self.rect.center
+        dt = self.clock.step
+
         # Natural regeneration - 1 HP per second
-        self.regen_timer += 1/60  # Assuming 60 FPS
+        self.regen_timer += dt
         if self.regen_timer >= 1.0:  # Every 1 second
             self.heal(1)  # Heal 1 HP
             self.regen_timer = 0
 
-        # Get current time at the beginning
-        current_time = time.time()
+        # Get current simulation time at the beginning
+        current_time = self.clock.time
         
         # Handle damage flash effect
         if self.is_damage_flashing:
-            self.damage_flash_time -= 1/60  # Assuming 60 FPS
+            self.damage_flash_time -= dt
             if self.damage_flash_time <= 0:
                 self.is_damage_flashing = False
 
@@ -157,7 +175,7 @@ class Player:
         if self.current_weapon == self.bow:
             # Special ability rapid fire
             if self.is_special_ability_active:
-                self.special_arrow_cooldown -= 1/60  # Assuming 60 FPS
+                self.special_arrow_cooldown -= dt
                 if self.special_arrow_cooldown <= 0:
                     arrow = self.bow.shoot_arrow(self.enemy_target)  # Pass enemy for aimbot assist
                     if arrow:
@@ -194,8 +212,8 @@ class Player:
             self.right_click_released = False
             self.charge_time = 0
 
-        # --- Get Keyboard Input ---
-        keys = pygame.key.get_pressed()
+        # --- Get Keyboard Input (live keyboard unless scripted keys were passed) ---
+        keys = keys_pressed if keys_pressed is not None else pygame.key.get_pressed()
         
         self.acc_x = 0
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
@@ -205,7 +223,7 @@ class Player:
 
         # Handle knockback with deceleration
         if self.is_knocked_back:
-            self.knockback_time -= 1/60
+            self.knockback_time -= dt
             # Decelerate knockback velocity
             self.knockback_vel_x *= KNOCKBACK_DECELERATION
             self.knockback_vel_y *= KNOCKBACK_DECELERATION
@@ -268,33 +286,31 @@ class Player:
         # --- Optimized Collision Detection ---
         self.on_ground = False
         
-        # Move horizontally with basic collision
+        # Move horizontally, checking only the tiles the player overlaps
         self.rect.x += int(dx)
-        for platform in platforms:
-            if self.rect.colliderect(platform):
-                if dx > 0:  # Moving right
-                    self.rect.right = platform.left
-                    self.vel_x = 0
-                elif dx < 0:  # Moving left
-                    self.rect.left = platform.right
-                    self.vel_x = 0
-                break
-        
-        # Move vertically with basic collision
+        for platform in world.solid_tiles(self.rect):
+            if dx > 0:  # Moving right
+                self.rect.right = platform.left
+                self.vel_x = 0
+            elif dx < 0:  # Moving left
+                self.rect.left = platform.right
+                self.vel_x = 0
+            break
+        
+        # Move vertically, checking only the tiles the player overlaps
         self.rect.y += int(dy)
-        for platform in platforms:
-            if self.rect.colliderect(platform):
-                if dy > 0:  # Moving down
-                    self.rect.bottom = platform.top
-                    self.vel_y = 0
-                    self.on_ground = True
-                    self.angle = 0
-                    self.jumps_left = 2
-                    self.bow.reset()
-                elif dy < 0:  # Moving up
-                    self.rect.top = platform.bottom
-                    self.vel_y = 0
-                break
+        for platform in world.solid_tiles(self.rect):
+            if dy > 0:  # Moving down
+                self.rect.bottom = platform.top
+                self.vel_y = 0
+                self.on_ground = True
+                self.angle = 0
+                self.jumps_left = 2
+                self.bow.reset()
+            elif dy < 0:  # Moving up
+                self.rect.top = platform.bottom
+                self.vel_y = 0
+            break
         
         target_angle = 0
         if not self.on_ground:
@@ -316,14 +332,12 @@ class Player:
         
         # Update bow when equipped
         if self.current_weapon == self.bow:
-            self.bow.update(self.rect, True, camera, self.charge_time if self.right_click_held else 0)
+            self.bow.update(self.rect, True, camera, self.charge_time if self.right_click_held else 0, mouse_pos)
         
 
         
-        # Update arrows
-        self.arrows = [arrow for arrow in self.arrows if arrow.alive]
-        for arrow in self.arrows:
-            arrow.update(platforms)
+        # Dead arrows go back to the pool (flight is stepped in bulk by the projectile engine)
+        self.arrows = arrow_pool.release_dead(self.arrows)
             
         # Update particle system
         self.particle_system.update()
@@ -331,50 +345,19 @@ class Player:
         # Update health tank
         self.health_bar.update()
         
-        # SUPER MOTION BLUR UPDATE - Add current position to blur trail
+        # MOTION BLUR - strong for dashing, weak for walking
+        self.blur_alpha = 0
         total_velocity = abs(self.vel_x) + abs(self.vel_y)
         if total_velocity > 0.5:  # Only add blur when moving
-            # Dynamic blur count based on speed (faster = MORE BLUR)
-            speed_multiplier = min(total_velocity / 5.0, 3.0)  # Cap at 3x multiplier
-            dynamic_max_copies = int(self.max_blur_copies * speed_multiplier)
-            dynamic_max_copies = max(20, dynamic_max_copies)  # Minimum 20 copies
-            
-            # Add current position to blur trail
-            if len(self.motion_blur_copies) >= dynamic_max_copies:
-                self.motion_blur_copies.pop(0)  # Remove oldest copy
-            
-            # CREATE MOTION BLUR - strong for dashing, weak for walking
             player_speed = math.sqrt(self.vel_x**2 + self.vel_y**2)
             if self.is_dashing:
-                # Strong blur when dashing
-                alpha = 70  # Strong dash blur
-                self.motion_blur_copies.append({
-                    'x': self.rect.centerx,
-                    'y': self.rect.centery,
-                    'angle': self.angle,
-                    'alpha': alpha,
-                    'image': self.image.copy()
-                })
-            elif player_speed > 1.0:  # Walking/moving blur
-                # Weak blur for normal movement
-                alpha = 25  # Much weaker walking blur
-                self.motion_blur_copies.append({
-                    'x': self.rect.centerx,
-                    'y': self.rect.centery,
-                    'angle': self.angle,
-                    'alpha': alpha,
-                    'image': self.image.copy()
-                })
-        
-        # Fade existing blur copies (adjusted for lighter background)
-        for i in range(len(self.motion_blur_copies) - 1, -1, -1):
-            self.motion_blur_copies[i]['alpha'] *= self.blur_alpha_decay
-            if self.motion_blur_copies[i]['alpha'] < 8:  # Remove very faded copies
-                self.motion_blur_copies.pop(i)
+                self.blur_alpha = PLAYER_BLUR_ALPHA
+            elif player_speed > 1.0:
+                self.blur_alpha = PLAYER_WALK_BLUR_ALPHA
         
         # Update special ability
         if self.is_special_ability_active:
-            self.special_ability_timer -= 1/60  # Assuming 60 FPS
+            self.special_ability_timer -= dt
             if self.special_ability_timer <= 0:
                 self.is_special_ability_active = False
         
@@ -414,8 +397,8 @@ class Player:
         self.dash_direction_x = dash_x
         self.dash_direction_y = dash_y
         self.is_dashing = True
-        self.dash_start_time = time.time()
-        self.dash_cooldown_start = time.time()
+        self.dash_start_time = self.clock.time
+        self.dash_cooldown_start = self.clock.time
         self.dash_trail.clear()  # Clear previous trail
         self.dash_speed = DASH_INITIAL_SPEED  # Set initial dash speed
         self.dash_roll_angle = 0  # Reset roll angle
@@ -435,64 +418,59 @@ class Player:
         self.special_ability_timer = 5.0  # 5 seconds
         self.special_arrow_cooldown = 0  # Reset arrow cooldown
 
+    def sprite_angle(self):
+        """Angle the player sprite is drawn at, in degrees"""
+        # Apply roll animation during dash
+        if self.is_dashing:
+            return self.angle + self.dash_roll_angle
+        return self.angle
+
+    def hit_mask(self):
+        """(mask, world rect) of the player sprite as drawn, for pixel-accurate hits"""
+        mask = rotated_mask(self.original_image, self.sprite_angle())
+        return mask, mask.get_rect(center=self.rect.center)
+
     def draw(self, screen, camera):
         """Draws the player on the screen with SUPER MOTION BLUR."""
-        
-        # DRAW MOTION BLUR COPIES FIRST (behind main player)
-        for copy in self.motion_blur_copies:
-            if copy['alpha'] > 10:  # Only draw visible copies
-                # Rotate the blur copy
-                blur_rotated = pygame.transform.rotate(copy['image'], copy['angle'])
-                blur_rect = blur_rotated.get_rect(center=(copy['x'], copy['y']))
-                
-                # Apply alpha transparency for blur effect
-                blur_surface = blur_rotated.copy()
-                blur_surface.set_alpha(int(copy['alpha']))
-                
-                # Draw the blur copy
-                screen.blit(blur_surface, camera.apply(blur_rect))
+        # Interpolate between the last two simulation steps for smooth rendering
+        center = camera.interpolate(self.prev_center, self.rect.center)
+        
+        # DRAW MOTION BLUR FIRST (behind main player)
+        self.motion_blur.begin_frame(screen, camera)
+        if self.blur_alpha:
+            blur_image = rotate(self.original_image, self.angle)
+            self.motion_blur.stamp(blur_image, center, camera, self.blur_alpha)
+        self.motion_blur.draw(screen)
 
-        # Apply roll animation during dash
-        player_angle = self.angle
-        if self.is_dashing:
-            player_angle += self.dash_roll_angle
-            
-        rotated_image = pygame.transform.rotate(self.original_image, player_angle)
-        new_rect = rotated_image.get_rect(center = self.rect.center)
-        
-        # Apply red flash effect when taking damage
-        if self.is_damage_flashing:
-            # Create red-tinted version
-            flash_surface = pygame.Surface(rotated_image.get_size(), pygame.SRCALPHA)
-            flash_surface.fill((255, 0, 0, 128))  # Semi-transparent red
-            
-            # Create flashed image
-            flashed_image = rotated_image.copy()
-            flashed_image.blit(flash_surface, (0, 0), special_flags=pygame.BLEND_MULT)
-            
-            screen.blit(flashed_image, camera.apply(new_rect))
-        else:
-            # Draw player normally without any brightness overlay
-            screen.blit(rotated_image, camera.apply(new_rect))
+        rotated_image = rotate(self.original_image, self.sprite_angle())
+        new_rect = rotated_image.get_rect(center = center)
+        
+        # Sprite and bow only when on screen (arrows, trail and particles cull themselves)
+        if camera.is_visible(new_rect, CULL_MARGIN, 'player'):
+            # Apply red flash effect when taking damage
+            if self.is_damage_flashing:
+                # Red-tinted version, rendered once per rotation
+                flashed_image = tint(rotated_image, DAMAGE_FLASH_COLOR)
+                render_queue.submit(flashed_image, new_rect.topleft, LAYER_ENTITIES)
+            else:
+                # Draw player normally without any brightness overlay
+                render_queue.submit(rotated_image, new_rect.topleft, LAYER_ENTITIES)
         
-        # Draw current equipped weapon
-        if self.current_weapon == self.bow:
-            self.bow.draw(screen, camera)
+            # Draw current equipped weapon
+            if self.current_weapon == self.bow:
+                self.bow.draw(screen, camera, center)
 
-        
         # Draw arrows
         for arrow in self.arrows:
             arrow.draw(screen, camera)
             
         # Draw dash trail
         if self.is_dashing:
-            self.dash_trail.draw(screen, camera)
+            render_queue.submit_call(LAYER_TRAILS, self.dash_trail.draw, camera)
             
         # Draw particles
         self.particle_system.draw(screen, camera)
-        
-        # Draw health tank (UI element - not affected by camera)
-        self.health_bar.draw(screen)
+        # (The health tank is a HUD widget - see draw_health)
             
     def handle_hotbar_click(self, mouse_pos):
         """Handle mouse clicks on hotbar"""
@@ -519,12 +497,12 @@ class Player:
                 
     def check_enemy_collision(self, enemy):
         """INSANE MODE: Boss damages player on contact!"""
-        if self.rect.colliderect(enemy.rect):
+        if self.rect.colliderect(enemy.rect) and entities_touch(self, enemy):
             # INSANE MODE: Boss deals contact damage to player!
             if not hasattr(self, 'last_contact_damage_time'):
                 self.last_contact_damage_time = 0
             
-            current_time = time.time()
+            current_time = self.clock.time
             if current_time - self.last_contact_damage_time > 0.5:  # Contact damage every 0.5 seconds
                 contact_damage = 15  # Boss deals damage on touch
                 self.take_damage(contact_damage)
@@ -539,64 +517,48 @@ class Player:
                     self.vel_y += dy * 0.2
 
                 
-    def check_arrow_hits(self, enemy):
-        """Check if arrows hit the enemy with smaller hitbox"""
-        for arrow in self.arrows[:]:
-            if arrow.alive:
-                # Create center-based hitbox for arrow
-                arrow_hitbox = pygame.Rect(
-                    arrow.rect.centerx - ARROW_HITBOX_SIZE//2,
-                    arrow.rect.centery - ARROW_HITBOX_SIZE//2,
-                    ARROW_HITBOX_SIZE,
-                    ARROW_HITBOX_SIZE
-                )
-                
-                if arrow_hitbox.colliderect(enemy.rect):
-                    # Create particle explosion on enemy hit
-                    self.particle_system.create_explosion(
-                        arrow.rect.centerx, arrow.rect.centery,
-                        ARROW_PARTICLE_COLOR, count=PARTICLE_COUNT
-                    )
-                    
-                    # Calculate arrow speed and impact force
-                    arrow_speed = math.sqrt(arrow.vel_x*arrow.vel_x + arrow.vel_y*arrow.vel_y)
-                    speed_ratio = max(arrow_speed / ARROW_BASE_SPEED, 0.5)  # Minimum 50% force for close shots
-                    
-                    # Reduce force if arrow has pierced blocks
-                    pierce_reduction = 1.0 - (arrow.blocks_pierced * 0.3)
-                    
-                    # Calculate realistic knockback based on arrow momentum
-                    force = BASE_KNOCKBACK_FORCE * ARROW_KNOCKBACK_MULTIPLIER * speed_ratio * pierce_reduction
-                    dx = math.cos(arrow.angle) * force
-                    dy = math.sin(arrow.angle) * force * 0.2  # Less vertical knockback
-                    
-                    # INSANE MODE: No stuns, boss is relentless!
-                    # Boss takes damage but never stops attacking
-                    if hasattr(enemy, 'is_jumping') and enemy.is_jumping:
-                        # Boss takes extra damage during spin but doesn't stop!
-                        print("Hit boss during death spin - extra damage but boss continues!")
-                        # Apply stronger knockback but boss keeps attacking
-                        enemy.apply_knockback(dx * 1.5, dy * 1.5, 0.3)  # Stronger but shorter knockback
-                    else:
-                        # Apply normal knockback to enemy
-                        enemy.apply_knockback(dx, dy, 0.5)  # Shorter knockback
-                    
-                    # Damage enemy based on arrow charge power (100x weaker than original)
-                    base_damage = 0.15  # Base damage (was 1.5, originally 15)
-                    charge_bonus = 0.35 * arrow.charge_power  # 0-0.35 bonus damage based on charge (was 0-3.5, originally 0-35)
-                    total_damage = base_damage + charge_bonus  # 0.15-0.5 total damage (was 1.5-5, originally 15-50)
-                    enemy.take_damage(total_damage)
-                    
-                    # GAIN MANA on hit!
-                    if self.mana < self.max_mana:
-                        self.mana += 1
-                        print(f"Arrow hit! Enemy damaged. Mana: {self.mana}/{self.max_mana}")
-                    
-                    # Remove arrow
-                    arrow.alive = False
-        
-        # Clean up dead arrows
-        self.arrows = [arrow for arrow in self.arrows if arrow.alive]
+    def resolve_arrow_hit(self, arrow, enemy, hit_time):
+        """One of our arrows reached the enemy's hitbox hit_time of the way along this step's flight"""
+        # Create particle explosion on enemy hit, where the arrow reached the hitbox
+        hit_x, hit_y = projectiles.point_at(arrow.slot, hit_time)
+        self.particle_system.create_explosion(hit_x, hit_y, ARROW_PARTICLE_COLOR, count=PARTICLE_COUNT)
+        
+        # Calculate arrow speed and impact force
+        arrow_speed = math.sqrt(arrow.vel_x*arrow.vel_x + arrow.vel_y*arrow.vel_y)
+        speed_ratio = max(arrow_speed / ARROW_BASE_SPEED, 0.5)  # Minimum 50% force for close shots
+        
+        # Reduce force if arrow has pierced blocks
+        pierce_reduction = 1.0 - (arrow.blocks_pierced * 0.3)
+        
+        # Calculate realistic knockback based on arrow momentum
+        force = BASE_KNOCKBACK_FORCE * ARROW_KNOCKBACK_MULTIPLIER * speed_ratio * pierce_reduction
+        dx = math.cos(arrow.angle) * force
+        dy = math.sin(arrow.angle) * force * 0.2  # Less vertical knockback
+        
+        # INSANE MODE: No stuns, boss is relentless!
+        # Boss takes damage but never stops attacking
+        if hasattr(enemy, 'is_jumping') and enemy.is_jumping:
+            # Boss takes extra damage during spin but doesn't stop!
+            print("Hit boss during death spin - extra damage but boss continues!")
+            # Apply stronger knockback but boss keeps attacking
+            enemy.apply_knockback(dx * 1.5, dy * 1.5, 0.3)  # Stronger but shorter knockback
+        else:
+            # Apply normal knockback to enemy
+            enemy.apply_knockback(dx, dy, 0.5)  # Shorter knockback
+        
+        # Damage enemy based on arrow charge power (100x weaker than original)
+        base_damage = 0.15  # Base damage (was 1.5, originally 15)
+        charge_bonus = 0.35 * arrow.charge_power  # 0-0.35 bonus damage based on charge (was 0-3.5, originally 0-35)
+        total_damage = base_damage + charge_bonus  # 0.15-0.5 total damage (was 1.5-5, originally 15-50)
+        enemy.take_damage(total_damage)
+        
+        # GAIN MANA on hit!
+        if self.mana < self.max_mana:
+            self.mana += 1
+            print(f"Arrow hit! Enemy damaged. Mana: {self.mana}/{self.max_mana}")
+        
+        # Remove arrow
+        arrow.alive = False  # Released to the pool on the next update
     
 
     
@@ -616,15 +578,16 @@ class Player:
         """Heal player"""
         self.health_bar.heal(amount)
     
-    def draw_hotbar(self, screen):
-        """Draw the hotbar and mana bar UI"""
-        self.hotbar.draw(screen)
-        
-        # Draw mana bar
-        mana_bar_x = 20
-        mana_bar_y = 120  # Below health bar
-        mana_bar_width = 160
-        mana_bar_height = 15
+    def draw_health(self, screen):
+        """Draw the health tank (UI element - not affected by camera)"""
+        self.health_bar.draw(screen)
+
+    def draw_mana_bar(self, screen):
+        """Draw the mana bar and its label"""
+        mana_bar_x = MANA_BAR_X
+        mana_bar_y = MANA_BAR_Y  # Below health bar
+        mana_bar_width = MANA_BAR_WIDTH
+        mana_bar_height = MANA_BAR_HEIGHT
         
         # Background
         pygame.draw.rect(screen, (40, 40, 40), (mana_bar_x - 2, mana_bar_y - 2, mana_bar_width + 4, mana_bar_height + 4))
@@ -641,9 +604,8 @@ class Player:
             pygame.draw.rect(screen, (100, 150, 255), (mana_bar_x, mana_bar_y, mana_fill_width, mana_bar_height))
         
         # Mana text
-        font = pygame.font.Font(None, 24)
         mana_text = f"MANA: {self.mana}/{self.max_mana}"
         if self.mana >= self.max_mana:
             mana_text += " - PRESS S FOR SPECIAL!"
-        text_surface = font.render(mana_text, True, (255, 255, 255))
+        text_surface = glyph_cache.text(mana_text, 24, (255, 255, 255))
         screen.blit(text_surface, (mana_bar_x, mana_bar_y + mana_bar_height + 5))
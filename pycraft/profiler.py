@@ -0,0 +1,175 @@
+import json
+import time
+from collections import deque
+
+import pygame
+from settings import PROFILER_HISTORY, PROFILER_GRAPH_MS, PROFILER_DUMP_SECONDS, FPS
+
+# Frame phases in stacking order, with their graph colors
+PROFILER_PHASES = [
+    ('input', (200, 200, 200)),
+    ('player', (80, 160, 255)),
+    ('projectiles', (120, 220, 255)),
+    ('ai', (255, 60, 160)),
+    ('enemies', (255, 90, 90)),
+    ('collisions', (255, 150, 60)),
+    ('particles', (255, 200, 60)),
+    ('camera', (160, 100, 255)),
+    ('tiles', (140, 90, 50)),
+    ('entities', (60, 220, 120)),
+    ('render', (40, 160, 160)),
+    ('scale', (0, 110, 200)),
+    ('hud', (255, 140, 220)),
+    ('flip', (120, 120, 120)),
+    ('overlay', (90, 90, 90)),
+]
+PHASE_COLORS = dict(PROFILER_PHASES)
+
+
+class FrameProfiler:
+    """Per-phase frame timer: one perf_counter call per phase, rolling history, overlay and dumps"""
+    def __init__(self, history=PROFILER_HISTORY):
+        self.history = deque(maxlen=history)  # One {phase: seconds} dict per frame
+        self.frames = 0  # Frames ended so far
+        self.current = {}
+        self.last = time.perf_counter()
+        self.frame_start = self.last
+        self.visible = False
+        self.capture = None  # Frames being recorded for a dump
+        self.capture_frames = 0
+        self.watches = []  # (label, callable returning text) shown in the overlay
+        self.font = None
+        self.panel = None
+        self.graph = None  # Cached bars, scrolled left as frames come in
+        self.graph_frames = 0  # self.frames when the graph was last brought up to date
+        self.text_lines = []
+        self.text_age = 0
+
+    def begin_frame(self):
+        """Start timing a frame"""
+        self.current = {}
+        self.frame_start = self.last = time.perf_counter()
+
+    def lap(self, phase):
+        """Charge the time since the previous lap to phase (accumulates across steps)"""
+        now = time.perf_counter()
+        self.current[phase] = self.current.get(phase, 0.0) + now - self.last
+        self.last = now
+
+    def end_frame(self):
+        """Store the finished frame in the rolling history and any running capture"""
+        frame = self.current
+        frame['total'] = self.last - self.frame_start
+        self.history.append(frame)
+        self.frames += 1
+        if self.capture is not None:
+            self.capture.append(frame)
+            if len(self.capture) >= self.capture_frames:
+                self.write_capture()
+
+    def watch(self, label, source):
+        """Show source() next to label in the overlay (e.g. cache or governor stats)"""
+        self.watches.append((label, source))
+
+    def toggle(self):
+        """Show or hide the overlay"""
+        self.visible = not self.visible
+
+    def start_capture(self, seconds=PROFILER_DUMP_SECONDS):
+        """Record every phase of the next few seconds of frames and dump them to a file"""
+        self.capture = []
+        self.capture_frames = int(seconds * FPS)
+        print(f"Profiler: capturing {self.capture_frames} frames...")
+
+    def write_capture(self):
+        """Dump the captured frames and their summary as JSON"""
+        path = time.strftime('frame_profile_%Y%m%d_%H%M%S.json')
+        with open(path, 'w') as f:
+            json.dump({'summary': self.summary(self.capture), 'frames': self.capture}, f, indent=1)
+        print(f"Profiler: wrote {len(self.capture)} frames to {path}")
+        self.capture = None
+
+    def summary(self, frames=None):
+        """Mean, p95 and max milliseconds per phase over frames (default: the rolling history)"""
+        frames = self.history if frames is None else frames
+        result = {}
+        for phase in [name for name, _ in PROFILER_PHASES] + ['total']:
+            samples = sorted(frame.get(phase, 0.0) * 1000 for frame in frames)
+            if samples:
+                result[phase] = {
+                    'mean_ms': sum(samples) / len(samples),
+                    'p95_ms': samples[int(0.95 * (len(samples) - 1))],
+                    'max_ms': samples[-1],
+                }
+        return result
+
+    def draw(self, screen):
+        """Draw the stacked frame-time graph and top offenders (when toggled on)"""
+        if not self.visible:
+            return
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+
+        width = self.history.maxlen
+        height = 120
+        x0 = screen.get_width() - width - 20
+        y0 = 20
+        if self.panel is None:
+            self.panel = pygame.Surface((width, height + 200), pygame.SRCALPHA)
+            self.panel.fill((0, 0, 0, 160))
+        screen.blit(self.panel, (x0, y0))
+
+        # Stacked bars, one pixel column per frame: only frames new since the last draw are added
+        if self.graph is None:
+            self.graph = pygame.Surface((width, height), pygame.SRCALPHA)
+            self.graph_frames = self.frames - width
+        new = min(self.frames - self.graph_frames, width, len(self.history))
+        if new:
+            self.graph.scroll(-new, 0)
+            self.graph.fill((0, 0, 0, 0), (width - new, 0, new, height))
+            for offset in range(new):
+                self.draw_column(width - new + offset, self.history[len(self.history) - new + offset], height)
+        self.graph_frames = self.frames
+        screen.blit(self.graph, (x0, y0))
+        # Frame budget line
+        scale = height / PROFILER_GRAPH_MS
+        base = y0 + height
+        budget_y = base - (1000 / FPS) * scale
+        pygame.draw.line(screen, (255, 255, 255), (x0, budget_y), (x0 + width, budget_y))
+
+        # Text is rebuilt a few times a second to keep the overlay cheap
+        self.text_age -= 1
+        if self.text_age <= 0:
+            self.text_age = 15
+            self.text_lines = [self.font.render(text, True, color) for text, color in self.build_text()]
+        y = base + 6
+        for line in self.text_lines:
+            screen.blit(line, (x0 + 6, y))
+            y += 16
+
+    def draw_column(self, column, frame, height):
+        """Draw one frame's stacked phase bar into the cached graph, scaled so PROFILER_GRAPH_MS fills it"""
+        scale = height / PROFILER_GRAPH_MS
+        y = height
+        for phase, color in PROFILER_PHASES:
+            bar = frame.get(phase, 0.0) * 1000 * scale
+            if bar >= 0.5:
+                top = max(y - bar, 0)
+                pygame.draw.line(self.graph, color, (column, y), (column, top))
+                y = top
+
+    def build_text(self):
+        """Overlay lines: frame totals, the top offending phases, then watched stats"""
+        summary = self.summary()
+        lines = []
+        total = summary.get('total')
+        if total:
+            lines.append((f"frame {total['mean_ms']:.2f} ms  p95 {total['p95_ms']:.2f}  max {total['max_ms']:.2f}",
+                          (255, 255, 255)))
+        offenders = sorted(((stats['mean_ms'], phase) for phase, stats in summary.items() if phase != 'total'),
+                           reverse=True)
+        for mean_ms, phase in offenders[:5]:
+            lines.append((f"{phase:<11} {mean_ms:6.2f} ms  p95 {summary[phase]['p95_ms']:.2f}", PHASE_COLORS[phase]))
+        for label, source in self.watches:
+            lines.append((f"{label}: {source()}", (200, 200, 200)))
+        return lines
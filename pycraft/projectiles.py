@@ -0,0 +1,296 @@
+import numpy as np
+from settings import (ARROW_GRAVITY, ARROW_PIERCE_COUNT, ARROW_PARTICLE_COLOR, PARTICLE_COUNT, TRAIL_LENGTH,
+                      PROJECTILE_CAPACITY, ARROW_WORLD_MARGIN)
+
+# Per-projectile fields, stored as one preallocated array each
+PROJECTILE_FIELDS = {
+    'x': np.float32,  # Center, world pixels
+    'y': np.float32,
+    'prev_x': np.float32,  # Last step's center, for render interpolation
+    'prev_y': np.float32,
+    'vel_x': np.float32,
+    'vel_y': np.float32,
+    'angle': np.float32,
+    'pierced': np.int16,  # Blocks pierced so far
+    'alive': np.bool_,
+    'hostile': np.bool_,  # Fired by an enemy: hits the player, not enemies
+    'landed': np.bool_,  # Stopped by a tile this step - its path up to the impact can still hit entities
+    'used': np.bool_,  # Slot belongs to an Arrow (alive or not)
+    'trail_count': np.int16,  # Valid entries in the trail ring
+}
+
+PIERCE_SLOWDOWN = 0.7  # Speed kept per pierced block
+
+# Arrows may arc this high above the level and still come back down
+WORLD_CEILING = -1000
+
+
+class ProjectileEngine:
+    """Every arrow in flight as a structure of NumPy arrays, advanced in bulk once per step.
+
+    Arrow objects are thin views onto a slot here; a slot lives until its Arrow is
+    released to the pool or garbage collected, so dead arrows stay readable.
+    """
+    def __init__(self, capacity=PROJECTILE_CAPACITY):
+        self.count = 0  # High-water mark: slots in use are all below it
+        self.capacity = 0
+        self.free_slots = []
+        self.particle_systems = []  # Per slot, where pierce/impact particles go
+        self.refs = []  # Per slot, weak reference to the Arrow viewing it
+        self.trail_head = 0  # Ring column written on the last step
+        self.trails = None  # Every slot's trail points as lists, gathered on demand until the next change
+        self.allocate(capacity)
+
+    def __len__(self):
+        return self.count - len(self.free_slots)
+
+    def allocate(self, capacity):
+        """(Re)allocate every field array, keeping existing slots"""
+        for name, dtype in PROJECTILE_FIELDS.items():
+            array = np.zeros(capacity, dtype)
+            if self.capacity:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        for name in ('trail_x', 'trail_y'):
+            array = np.zeros((capacity, TRAIL_LENGTH), np.float32)
+            if self.capacity:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self.particle_systems.extend([None] * (capacity - self.capacity))
+        self.refs.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def spawn(self, x, y, vel_x, vel_y, angle, ref=None):
+        """Claim a slot for a new projectile and return its index"""
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            if self.count == self.capacity:
+                self.allocate(self.capacity * 2)
+            slot = self.count
+            self.count += 1
+        self.x[slot] = self.prev_x[slot] = x
+        self.y[slot] = self.prev_y[slot] = y
+        self.vel_x[slot] = vel_x
+        self.vel_y[slot] = vel_y
+        self.angle[slot] = angle
+        self.pierced[slot] = 0
+        self.alive[slot] = True
+        self.hostile[slot] = False
+        self.landed[slot] = False
+        self.used[slot] = True
+        # Trail starts at the launch point
+        self.trail_x[slot, self.trail_head] = x
+        self.trail_y[slot, self.trail_head] = y
+        self.trail_count[slot] = 1
+        self.particle_systems[slot] = None
+        self.refs[slot] = ref
+        self.trails = None
+        return slot
+
+    def free(self, slot):
+        """Give a slot back once its Arrow is gone"""
+        self.alive[slot] = False
+        self.landed[slot] = False
+        self.used[slot] = False
+        self.particle_systems[slot] = None
+        self.refs[slot] = None
+        self.free_slots.append(slot)
+        # Trim free slots off the end so bulk updates cover as few as possible
+        if slot == self.count - 1:
+            count = slot
+            while count and not self.used[count - 1]:
+                count -= 1
+            self.count = count
+            self.free_slots = [free for free in self.free_slots if free < count]
+
+    def trail_table(self, limit):
+        """Every slot's last limit ring entries (oldest first) as Python lists, in one gather.
+
+        The ring head is shared by all slots, so one column order serves every row. The table is
+        kept until the next step or spawn, so all arrows drawn in a frame share it.
+        """
+        if self.trails is None or self.trails[0] != limit:
+            length = min(limit, TRAIL_LENGTH)
+            columns = (self.trail_head - length + 1 + np.arange(length)) % TRAIL_LENGTH
+            n = self.count
+            self.trails = (limit, self.trail_x[:n, columns].tolist(), self.trail_y[:n, columns].tolist(),
+                           self.trail_count[:n].tolist())
+        return self.trails
+
+    def trail_points(self, slot, limit=TRAIL_LENGTH):
+        """Return the slot's recent centers (at most limit), oldest first"""
+        _, xs, ys, counts = self.trail_table(limit)
+        count = min(counts[slot], limit)
+        if not count:
+            return []
+        return list(zip(xs[slot][-count:], ys[slot][-count:]))
+
+    def update(self, world, effects_area=None):
+        """Advance every live projectile one step and resolve pierces and impacts along its path.
+
+        Impact particles are only spawned inside effects_area (a world rect) when one is given.
+        """
+        self.trails = None
+        n = self.count
+        if not n:
+            return
+        self.landed[:n] = False
+        live = np.flatnonzero(self.alive[:n])
+        if not live.size:
+            return
+
+        x = self.x[live].astype(np.float64)
+        y = self.y[live].astype(np.float64)
+        vel_x = self.vel_x[live].astype(np.float64)
+        vel_y = self.vel_y[live].astype(np.float64) + ARROW_GRAVITY  # Apply gravity
+        self.prev_x[live] = x
+        self.prev_y[live] = y
+        self.angle[live] = np.arctan2(vel_y, vel_x)
+
+        # Swept collision: walk the cells the step's path crosses, in order
+        pierced = self.pierced[live]
+        hit_t, slowdown, events = self.sweep_tiles(world, live, x, y, vel_x, vel_y, pierced)
+        alive = hit_t > 1.0
+        x += vel_x * np.minimum(hit_t, 1.0)
+        y += vel_y * np.minimum(hit_t, 1.0)
+        vel_x *= slowdown
+        vel_y *= slowdown
+
+        # Trail: every live projectile writes the same ring column
+        self.trail_head = head = (self.trail_head + 1) % TRAIL_LENGTH
+        self.trail_x[live, head] = x
+        self.trail_y[live, head] = y
+        self.trail_count[live] = np.minimum(self.trail_count[live] + 1, TRAIL_LENGTH)
+
+        # Particle effects, only for the few projectiles that hit something this step
+        particle_systems = self.particle_systems
+        for slot, event_x, event_y, count in events:
+            if effects_area is not None and not effects_area.collidepoint(event_x, event_y):
+                continue  # Too far away for anyone to see
+            particle_system = particle_systems[slot]
+            if particle_system is not None:
+                particle_system.create_explosion(event_x, event_y, ARROW_PARTICLE_COLOR, count=count)
+
+        # Arrows stopped by a tile keep the path up to the impact for entity checks
+        self.landed[live] = ~alive
+        # Remove arrows that leave the level - past either side or below it, they never come back
+        margin = ARROW_WORLD_MARGIN
+        alive &= ((x >= -margin) & (x <= world.width + margin)
+                  & (y >= WORLD_CEILING) & (y <= world.height + margin))
+
+        self.x[live] = x
+        self.y[live] = y
+        self.vel_x[live] = vel_x
+        self.vel_y[live] = vel_y
+        self.pierced[live] = pierced
+        self.alive[live] = alive
+
+    def sweep_tiles(self, world, slots, x, y, vel_x, vel_y, pierced):
+        """Grid traversal (DDA) of each segment (x, y) + t * vel, t in [0, 1], for all projectiles at once.
+
+        Every solid cell entered costs one pierce (pierced is updated in place); the first solid cell
+        past ARROW_PIERCE_COUNT stops the projectile. Returns the stopping t (inf if none), the velocity
+        factor from the pierces, and (slot, x, y, particle count) impact events in path order.
+        """
+        size = world.tile_size
+        count = slots.size
+        col = np.floor(x / size).astype(np.intp)
+        row = np.floor(y / size).astype(np.intp)
+        end_x = x + vel_x
+        end_y = y + vel_y
+        steps = (np.abs(np.floor(end_x / size).astype(np.intp) - col)
+                 + np.abs(np.floor(end_y / size).astype(np.intp) - row))
+
+        # Distance (in t) to the first vertical / horizontal cell boundary, and between boundaries
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step_x = np.where(vel_x > 0, 1, -1)
+            step_y = np.where(vel_y > 0, 1, -1)
+            next_x = np.where(vel_x > 0, (col + 1) * size, col * size)
+            next_y = np.where(vel_y > 0, (row + 1) * size, row * size)
+            t_max_x = np.where(vel_x != 0, (next_x - x) / vel_x, np.inf)
+            t_max_y = np.where(vel_y != 0, (next_y - y) / vel_y, np.inf)
+            t_delta_x = np.where(vel_x != 0, size / np.abs(vel_x), np.inf)
+            t_delta_y = np.where(vel_y != 0, size / np.abs(vel_y), np.inf)
+
+        hit_t = np.full(count, np.inf)
+        pierces = np.zeros(count, np.int16)
+        events = []
+        # The starting cell was handled when the projectile entered it
+        for k in range(int(steps.max())):
+            active = np.flatnonzero((k < steps) & np.isinf(hit_t))
+            if not active.size:
+                break
+            along_x = t_max_x[active] < t_max_y[active]
+            moving_x = active[along_x]
+            moving_y = active[~along_x]
+            t = np.empty(active.size)
+            t[along_x] = t_max_x[moving_x]
+            t[~along_x] = t_max_y[moving_y]
+            col[moving_x] += step_x[moving_x]
+            t_max_x[moving_x] += t_delta_x[moving_x]
+            row[moving_y] += step_y[moving_y]
+            t_max_y[moving_y] += t_delta_y[moving_y]
+
+            solid = world.solid_cells(col[active], row[active])
+            if not solid.any():
+                continue
+            entering = active[solid]
+            t = t[solid]
+            stops = pierced[entering] >= ARROW_PIERCE_COUNT
+            pierced[entering[~stops]] += 1
+            pierces[entering[~stops]] += 1
+            hit_t[entering[stops]] = t[stops]
+            impact_x = x[entering] + vel_x[entering] * t
+            impact_y = y[entering] + vel_y[entering] * t
+            events.extend(zip(slots[entering].tolist(), impact_x.tolist(), impact_y.tolist(),
+                              np.where(stops, PARTICLE_COUNT, 4).tolist()))
+        return hit_t, PIERCE_SLOWDOWN ** pierces, events
+
+    def sweep_boxes(self, slots, left, top, right, bottom):
+        """Where along this step's path each projectile first enters a box (edges broadcast per slot).
+
+        Returns t in [0, 1] per slot, or inf for a miss (dead projectiles never hit,
+        ones stopped by a tile only up to the impact).
+        """
+        x0 = self.prev_x[slots].astype(np.float64)
+        y0 = self.prev_y[slots].astype(np.float64)
+        dx = self.x[slots] - x0
+        dy = self.y[slots] - y0
+        # Slab test against the box on each axis
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t1x = (left - x0) / dx
+            t2x = (right - x0) / dx
+            t1y = (top - y0) / dy
+            t2y = (bottom - y0) / dy
+        # Not moving on an axis: inside the slab for all t, or never
+        inside_x = (x0 >= left) & (x0 <= right)
+        inside_y = (y0 >= top) & (y0 <= bottom)
+        enter_x = np.where(dx != 0, np.minimum(t1x, t2x), np.where(inside_x, -np.inf, np.inf))
+        exit_x = np.where(dx != 0, np.maximum(t1x, t2x), np.where(inside_x, np.inf, -np.inf))
+        enter_y = np.where(dy != 0, np.minimum(t1y, t2y), np.where(inside_y, -np.inf, np.inf))
+        exit_y = np.where(dy != 0, np.maximum(t1y, t2y), np.where(inside_y, np.inf, -np.inf))
+        enter = np.maximum(np.maximum(enter_x, enter_y), 0.0)
+        leave = np.minimum(np.minimum(exit_x, exit_y), 1.0)
+        hits = (enter <= leave) & (self.alive[slots] | self.landed[slots])
+        return np.where(hits, enter, np.inf)
+
+    def in_flight(self):
+        """Slots whose path this step can still hit something (alive, or stopped by a tile this step)"""
+        n = self.count
+        return np.flatnonzero(self.alive[:n] | self.landed[:n])
+
+    def arrow(self, slot):
+        """The Arrow viewing a slot, or None if it has been dropped"""
+        ref = self.refs[slot]
+        return ref() if ref is not None else None
+
+    def point_at(self, slot, t):
+        """World position t of the way along the slot's path this step"""
+        x0 = float(self.prev_x[slot])
+        y0 = float(self.prev_y[slot])
+        return (x0 + (float(self.x[slot]) - x0) * t, y0 + (float(self.y[slot]) - y0) * t)
+
+
+# Shared by every Arrow, player and enemy alike
+projectiles = ProjectileEngine()
@@ -0,0 +1,86 @@
+import time
+from collections import deque
+from itertools import islice
+from settings import (FPS, QUALITY_LEVELS, QUALITY_START, QUALITY_ADAPTIVE, QUALITY_WINDOW, QUALITY_DROP_LOAD,
+                      QUALITY_RAISE_LOAD, QUALITY_RAISE_FRAMES, QUALITY_LOG_SIZE)
+
+
+class QualityGovernor:
+    """Effect budgets scaled to hold the frame rate, judged from measured frame times.
+
+    Each level sets the arrow blur stamps per frame, the trail segments drawn, the share of cosmetic
+    particles spawned and the margin around the camera view where impact effects appear. A window of
+    frames over budget drops a level at once; climbing back takes a long run of frames with headroom,
+    and every change waits for a fresh window, so the level doesn't flap around the threshold.
+    """
+    def __init__(self, levels=QUALITY_LEVELS, start=QUALITY_START, adaptive=QUALITY_ADAPTIVE, fps=FPS):
+        self.levels = levels
+        self.names = [name for name, *_ in levels]
+        self.adaptive = adaptive
+        self.budget_ms = 1000 / fps
+        self.load = 0.0  # Mean frame time over the last window, as a share of the budget
+        self.decisions = deque(maxlen=QUALITY_LOG_SIZE)  # (clock time, from level, to level, mean ms)
+        self.set_level(self.names.index(start))
+
+    def set_level(self, index):
+        """Switch every budget to a level (by index, lowest first)"""
+        self.level = index
+        self.name, self.blur_stamps, self.trail_length, self.particle_fraction, self.effects_margin = \
+            self.levels[index]
+        self.settled = 0  # Frames measured since the change
+        self.headroom = 0  # Consecutive frames under the raise threshold
+
+    def particle_count(self, count):
+        """Cosmetic particles to spawn for a burst of count at the current level"""
+        return max(1, round(count * self.particle_fraction)) if count > 0 else 0
+
+    def update(self, history):
+        """Judge the latest frame of a profiler's rolling history; returns True if the level changed"""
+        if not self.adaptive or not history:
+            return False
+        self.settled += 1
+        if self.frame_ms(history[-1]) < self.budget_ms * QUALITY_RAISE_LOAD:
+            self.headroom += 1
+        else:
+            self.headroom = 0
+        if self.settled < QUALITY_WINDOW:
+            return False
+
+        mean_ms = sum(self.frame_ms(frame) for frame in islice(reversed(history), QUALITY_WINDOW)) / QUALITY_WINDOW
+        self.load = mean_ms / self.budget_ms
+        if self.load > QUALITY_DROP_LOAD and self.level > 0:
+            return self.change(self.level - 1, mean_ms)
+        if self.headroom >= QUALITY_RAISE_FRAMES and self.level < len(self.levels) - 1:
+            return self.change(self.level + 1, mean_ms)
+        return False
+
+    @staticmethod
+    def frame_ms(frame):
+        """A profiled frame's time, less the profiler overlay's own drawing"""
+        return (frame['total'] - frame.get('overlay', 0.0)) * 1000
+
+    def change(self, index, mean_ms):
+        """Move to a level and log why"""
+        previous = self.name
+        self.set_level(index)
+        self.decisions.append((time.strftime('%H:%M:%S'), previous, self.name, round(mean_ms, 2)))
+        print(f"Quality: {previous} -> {self.name} (frames averaging {mean_ms:.1f} ms of a "
+              f"{self.budget_ms:.1f} ms budget)")
+        return True
+
+    def stats(self):
+        """Current level, its budgets and the governor's recent decisions, for the profiler overlay"""
+        return {
+            'level': self.name,
+            'load': self.load,
+            'blur_stamps': self.blur_stamps,
+            'trail_length': self.trail_length,
+            'particle_fraction': self.particle_fraction,
+            'effects_margin': self.effects_margin,
+            'changes': len(self.decisions),
+            'last': self.decisions[-1] if self.decisions else None,
+        }
+
+
+# Read by the effect code (blur, trails, particles, impact effects); main.py feeds it frame times
+quality = QualityGovernor()
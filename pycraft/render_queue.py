@@ -0,0 +1,98 @@
+import pygame
+from operator import itemgetter
+
+# Draw layers, back to front
+LAYER_BACKGROUND = 0
+LAYER_TILES = 1
+LAYER_BLUR = 2
+LAYER_TRAILS = 3
+LAYER_ENTITIES = 4
+LAYER_WEAPONS = 5
+LAYER_PROJECTILES = 6
+LAYER_PARTICLES = 7
+
+# pygame-ce's faster fblits, when available
+HAS_FBLITS = hasattr(pygame.Surface, 'fblits')
+
+
+class RenderQueue:
+    """Deferred drawing: blits are recorded during the draw pass and issued in bulk on flush.
+
+    Records are (surface, position, layer, flags); world positions get the camera offset at flush.
+    Records are sorted by layer (stable, so submission order holds within a layer) and every run of
+    same-layer, same-blend records becomes one Surface.blits call. Drawing that isn't a blit
+    (lines, legacy draw methods) is queued as a call, run in its place in the layer order.
+
+    Blits are read at flush, not at submit: a submitted surface (and its area rect) must not change
+    before the flush. Drawing whose source is still being written to (the motion blur buffer) is
+    queued as a call instead, so it reads its state when it runs.
+    """
+    def __init__(self):
+        self.records = []  # (layer, flags, screen space, items) or (layer, None, function, args)
+        self.submitted = 0  # Blits issued on the last flush
+        self.batches = 0  # blits/fblits calls on the last flush
+
+    def submit(self, surface, position, layer, flags=0, area=None, screen_space=False):
+        """Queue one blit at a world (or screen) position"""
+        item = (surface, position) if area is None else (surface, position, area)
+        self.records.append((layer, flags, screen_space, [item]))
+
+    def submit_many(self, items, layer, flags=0, screen_space=False):
+        """Queue a prepared sequence of (surface, position) blits"""
+        self.records.append((layer, flags, screen_space, items))
+
+    def submit_call(self, layer, function, *args):
+        """Queue function(screen, *args), for drawing that isn't a blit"""
+        self.records.append((layer, None, function, args))
+
+    def flush(self, screen, camera):
+        """Issue every queued record in layer order, one blits call per layer and blend mode"""
+        offset_x, offset_y = camera.camera.topleft
+        self.submitted = 0
+        self.batches = 0
+        # Queued calls may submit more (e.g. an enemy drawing its arrows): those go in a later pass
+        while self.records:
+            records = sorted(self.records, key=itemgetter(0))
+            self.records = []
+            batch = []
+            batch_key = None
+            for layer, flags, space, items in records:
+                if flags is None:
+                    self.issue(screen, batch, batch_key)
+                    batch = []
+                    batch_key = None
+                    space(screen, *items)
+                    continue
+                if (layer, flags) != batch_key:
+                    self.issue(screen, batch, batch_key)
+                    batch = []
+                    batch_key = (layer, flags)
+                if space:
+                    batch.extend(items)
+                else:
+                    # Camera offset for the whole record at once
+                    batch.extend([(item[0], (item[1][0] + offset_x, item[1][1] + offset_y)) + item[2:]
+                                  for item in items])
+            self.issue(screen, batch, batch_key)
+
+    def issue(self, screen, batch, batch_key):
+        """One SDL submission for a run of same-layer, same-blend blits"""
+        if not batch:
+            return
+        flags = batch_key[1]
+        self.submitted += len(batch)
+        self.batches += 1
+        if HAS_FBLITS and all(len(item) == 2 for item in batch):
+            screen.fblits(batch, flags)
+        elif flags:
+            screen.blits([(item[0], item[1], item[2] if len(item) > 2 else None, flags) for item in batch], False)
+        else:
+            screen.blits(batch, False)
+
+    def stats(self):
+        """Blits and SDL submissions on the last flush, for the profiler overlay"""
+        return {'blits': self.submitted, 'batches': self.batches}
+
+
+# Shared by every draw method; Game.draw flushes it once per frame
+render_queue = RenderQueue()
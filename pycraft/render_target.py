@@ -0,0 +1,67 @@
+import pygame
+from settings import RENDER_PRESETS, RENDER_PRESET, RENDER_HUD_NATIVE, RENDER_SMOOTH_SCALE
+
+
+class RenderTarget:
+    """The surface the world is drawn on: an internal resolution scaled to the display once per frame.
+
+    A preset fixes the internal height and the width follows the display's aspect ratio. A preset
+    at or above the display's height draws straight onto the display, with no scaling pass. The
+    HUD goes either into the internal surface (scaled with the world) or onto the display after
+    scaling, sharp at the display's resolution.
+
+    World pixels map 1:1 to internal pixels, so the internal size is also the camera's view: a
+    lower preset zooms in, showing less of the world. Anything sized from the view (culling,
+    simulation tiers, the effects area) follows it through Game.resize.
+    """
+    def __init__(self, display, preset=RENDER_PRESET, hud_native=RENDER_HUD_NATIVE, smooth=RENDER_SMOOTH_SCALE):
+        self.display = display
+        self.hud_native = hud_native
+        self.smooth = smooth
+        self.presets = dict(RENDER_PRESETS)
+        self.names = [name for name, _ in RENDER_PRESETS]
+        self.set_preset(preset)
+
+    def set_preset(self, name):
+        """Switch to a named preset and return the new world view size"""
+        height = self.presets[name]
+        display_width, display_height = self.display.get_size()
+        self.preset = name
+        if height is None or height >= display_height:
+            self.surface = self.display
+        else:
+            width = max(1, round(display_width * height / display_height))
+            self.surface = pygame.Surface((width, height)).convert(self.display)
+        self.size = self.surface.get_size()
+        self.hud_size = self.display.get_size() if self.hud_native else self.size
+        self.scale_x = display_width / self.size[0]
+        self.scale_y = display_height / self.size[1]
+        return self.size
+
+    def next_preset(self):
+        """Cycle to the next preset and return the new world view size"""
+        return self.set_preset(self.names[(self.names.index(self.preset) + 1) % len(self.names)])
+
+    def to_view(self, point):
+        """Display coordinates (e.g. the mouse) to world view coordinates"""
+        return (int(point[0] / self.scale_x), int(point[1] / self.scale_y))
+
+    def to_hud(self, point):
+        """Display coordinates to HUD coordinates"""
+        return point if self.hud_native else self.to_view(point)
+
+    def present(self, draw_hud=None, profiler=None):
+        """Scale the finished world onto the display, with draw_hud(surface) at the HUD's resolution"""
+        if draw_hud is not None and not self.hud_native:
+            draw_hud(self.surface)
+        if self.surface is not self.display:
+            scale = pygame.transform.smoothscale if self.smooth else pygame.transform.scale
+            scale(self.surface, self.display.get_size(), self.display)
+            if profiler is not None:
+                profiler.lap('scale')
+        if draw_hud is not None and self.hud_native:
+            draw_hud(self.display)
+
+    def stats(self):
+        """Preset and resolutions, for the profiler overlay"""
+        return {'preset': self.preset, 'internal': self.size, 'display': self.display.get_size()}
@@ -0,0 +1,56 @@
+import pygame
+from surface_cache import SurfaceCache
+from settings import ROTATION_CACHE_STEP, ROTATION_CACHE_MAX_BYTES
+
+
+class RotationCache(SurfaceCache):
+    """LRU cache of rotated sprites (and their hit masks) at quantized angles, capped by memory"""
+    def __init__(self, step=ROTATION_CACHE_STEP, max_bytes=ROTATION_CACHE_MAX_BYTES):
+        super().__init__(max_bytes)
+        self.step = step  # Angle quantization in degrees
+        self.mask_hits = 0  # Mask lookups are counted apart, so per-step hit tests don't inflate hit_rate
+        self.mask_misses = 0
+
+    def quantize(self, angle):
+        """Snap an angle in degrees to the cache step, normalized to [0, 360)"""
+        return (round(angle / self.step) * self.step) % 360
+
+    def rotate(self, surface, angle):
+        """Return surface rotated counter-clockwise by angle degrees (shared, do not modify)"""
+        quantized = self.quantize(angle)
+        return self.get(surface, (quantized,), lambda: pygame.transform.rotate(surface, quantized))
+
+    def mask(self, surface, angle):
+        """Return the pixel mask of the rotated sprite, built once alongside it"""
+        quantized = self.quantize(angle)
+        entry = self.entry(surface, (quantized,))
+        if entry is None:
+            entry = self.add(surface, (quantized,), pygame.transform.rotate(surface, quantized))
+        if entry[3] is not None:
+            self.mask_hits += 1
+            return entry[3]
+        self.mask_misses += 1
+        entry[3] = pygame.mask.from_surface(entry[1])
+        self.grow(entry, entry[1].get_width() * entry[1].get_height() // 8)
+        return entry[3]
+
+    def stats(self):
+        """Return hit rates and memory usage for tuning"""
+        stats = super().stats()
+        stats['mask_hits'] = self.mask_hits
+        stats['mask_misses'] = self.mask_misses
+        return stats
+
+
+# Shared by every sprite that rotates: player, arrows, bow and enemies
+rotation_cache = RotationCache()
+
+
+def rotate(surface, angle):
+    """Cached drop-in for pygame.transform.rotate"""
+    return rotation_cache.rotate(surface, angle)
+
+
+def rotated_mask(surface, angle):
+    """Cached pixel mask of surface rotated by angle degrees"""
+    return rotation_cache.mask(surface, angle)
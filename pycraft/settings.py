@@ -3,7 +3,10 @@ import pygame
 # --- Constants ---
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-FPS = 60
+FPS = 60  # Render frame cap
+SIMULATION_RATE = 60  # Fixed simulation steps per second, independent of FPS
+SIM_STEP = 1 / SIMULATION_RATE
+MAX_FRAME_TIME = 0.25  # Longest frame the simulation will catch up on
 
 # Colors
 SKY_BLUE = (135, 206, 235)
@@ -32,8 +35,14 @@ BOW_TILT_ANGLE = -45
 ARROW_BASE_SPEED = 8  # Minimum arrow speed
 ARROW_MAX_SPEED = 24  # Maximum arrow speed when fully charged
 ARROW_GRAVITY = 0.2
+AIM_TABLE_CELL = 16  # Pixels between ballistic aim table entries
+AIM_TABLE_RANGE = 1600  # Target offsets covered by the aim tables, each way
+AIM_TABLE_SPEEDS = 17  # Launch speeds tabulated from ARROW_BASE_SPEED to ARROW_MAX_SPEED
+AIM_TABLE_FAN = 1024  # Launch angles traced while building the tables
+AIM_LEAD_ITERATIONS = 2  # Re-aims at a moving target's predicted position
 ARROW_SIZE = 1.0
 ARROW_BLUE_TINT = (100, 150, 255)  # Blue tint color
+ARROW_TINT_ALPHA = 128  # Alpha of the tint blended into arrow sprites
 
 # Bow charging settings
 BOW_CHARGE_TIME = 1.1  # Seconds to reach full charge
@@ -42,12 +51,24 @@ BOW_SHAKE_FREQUENCY = 0.2  # How fast the shake oscillates
 BOW_ARROW_OFFSET = 30  # How far back the arrow is drawn when charging
 BOW_ARROW_SCALE = 1.3  # Scale of the arrow when held in bow (much bigger)
 
+# Rotation cache settings
+ROTATION_CACHE_STEP = 1  # Degrees between cached sprite rotations
+ROTATION_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Memory cap before LRU eviction
+TINT_CACHE_MAX_BYTES = 16 * 1024 * 1024  # Memory cap of the tinted sprite cache
+
 # Trail settings
 TRAIL_LENGTH = 12  # Number of trail segments
 TRAIL_FADE_RATE = 0.8  # How quickly trail fades (0.0 to 1.0)
 ARROW_TRAIL_COLOR = (135, 206, 235)  # Sky blue trail for arrows
 TRAIL_WIDTH = 6  # Base width of trail lines
 
+# Motion blur settings (accumulation buffer, one per layer)
+PLAYER_BLUR_DECAY = 0.88  # Fraction of the player blur kept each simulation step
+PLAYER_BLUR_ALPHA = 70  # Blur strength while dashing
+PLAYER_WALK_BLUR_ALPHA = 25  # Much weaker blur while walking
+ARROW_BLUR_DECAY = 0.94  # Arrows fade slower for longer streaks
+ARROW_BLUR_ALPHA = 28  # Light blur for arrows
+
 # Hotbar settings
 HOTBAR_SLOTS = 3  # Simplified for bow-only game
 HOTBAR_SLOT_SIZE = 48  # Smaller for horizontal layout
@@ -70,6 +91,13 @@ HEALTH_VOID_COLOR = (255, 255, 255)  # White for void damage
 HEALTH_DRAIN_SPEED = 1000.0  # How fast blood drains when damaged (20x faster)
 HEALTH_FLUID_GRAVITY = 400.0  # How fast fluid settles (20x faster)
 HEALTH_FLUID_VISCOSITY = 0.015  # Even lower viscosity for instant flow (20x faster)
+MANA_BAR_X = 20
+MANA_BAR_Y = 120  # Below the health tank
+MANA_BAR_WIDTH = 160
+MANA_BAR_HEIGHT = 15
+MANA_LABEL_WIDTH = 360  # Room for the mana label beside and below the bar
+GLYPH_CACHE_SIZE = 256  # Rendered UI strings kept
+GLYPH_ICON_MAX_BYTES = 4 * 1024 * 1024  # Memory cap of the scaled icon cache
 HOTBAR_KEYS = [pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4, pygame.K_5, pygame.K_6, 
                pygame.K_7, pygame.K_8, pygame.K_9, pygame.K_0, pygame.K_MINUS, pygame.K_EQUALS]
 
@@ -88,10 +116,17 @@ KNOCKBACK_MAX_DURATION = 0.5  # Maximum knockback time
 ARROW_HITBOX_SIZE = 16  # Better hitbox for arrows (doubled)  
 ARROW_KNOCKBACK_MULTIPLIER = 1.2  # More realistic arrow knockback
 ARROW_PIERCE_COUNT = 3  # Number of blocks arrows can pierce through (increased!)
+ARROW_POOL_SIZE = 512  # Dead arrows kept for reuse
+PROJECTILE_CAPACITY = 256  # Initial projectile engine slots (grows as needed)
+BROADPHASE_CELL_SIZE = 128  # Spatial hash cell for projectile vs entity checks
+HITMASK_SAMPLE_SPACING = 6  # Max pixels between pixel-mask tests along an arrow's path
+CULL_MARGIN = 64  # Pixels beyond the screen edge a sprite's anchor may sit and still be drawn
+ARROW_WORLD_MARGIN = 400  # Arrows this far outside the level (sides and bottom) are dropped
 
 # Hit effect settings
 HIT_FLASH_DURATION = 0.15  # How long the red flash lasts
 HIT_FLASH_COLOR = (255, 100, 100)  # Red flash color
+DAMAGE_FLASH_COLOR = (255, 0, 0, 128)  # Tint multiplied into the player sprite while flashing
 DASH_INVINCIBILITY = True  # Player is invincible while dashing
 ENEMY_COLLISION_KNOCKBACK_RATIO = 0.0  # Enemy takes no knockback when hitting player
 COLLISION_SEPARATION_FORCE = 2  # Force to separate overlapping entities
@@ -102,6 +137,10 @@ PARTICLE_SPEED_MIN = 2  # Minimum particle speed
 PARTICLE_SPEED_MAX = 6  # Maximum particle speed
 PARTICLE_LIFETIME = 1.0  # How long particles last in seconds
 PARTICLE_SIZE = 3  # Size of particles
+PARTICLE_GRAVITY = 0.2  # Downward acceleration per frame
+PARTICLE_DRAG = 0.98  # Air resistance multiplier per frame
+PARTICLE_CAPACITY = 1024  # Initial particle array size (grows as needed)
+PARTICLE_ALPHA_BUCKETS = 16  # Fade steps pre-rendered in the particle atlas
 ARROW_PARTICLE_COLOR = (100, 150, 255)  # Blue particles for arrows
 DASH_TRAIL_COLOR = (255, 255, 255)  # White trail for dash
 DASH_TRAIL_LENGTH = 8  # Number of trail segments for dash
@@ -125,10 +164,61 @@ ENEMY_STAFF_ROTATION_OFFSET = -45  # Default rotation offset (45 degrees to the
 ENEMY_ROTATIONAL_OFFSET = -45  # Additional rotational offset for weapon facing
 ENEMY_GLOW_COLOR = (100, 150, 255)  # Blue glow color
 
+ENEMY_COUNT = 10  # Archers spawned by main.py
+
+# Simulation level of detail (margins around the simulated camera view, world pixels)
+LOD_FULL_MARGIN = 320  # Full simulation within this far outside the view (so never less on screen)
+LOD_SLEEP_MARGIN = 1800  # Reduced tick rate up to this far outside the view, asleep beyond it
+LOD_REDUCED_INTERVAL = 4  # Reduced entities run one step in this many
+LOD_CATCHUP_STEPS = 3  # Extra owed steps an entity replays per step once back in full range
+LOD_MAX_DEBT = SIMULATION_RATE * 5  # Owed steps kept at most (a longer sleep is partly forgotten)
+
+# Enemy AI planning (enemies that split out an expensive plan() step)
+AI_PLAN_BUDGET_MS = 1.0  # Planning time allowed per simulation step
+AI_PRIORITY_DISTANCE = 400  # Enemies this far from the player get plans half as often
+
+# Enemy navigation
+NAV_AREA_SIZE = 4  # Goals within the same block of this many tiles share one route table
+NAV_ROUTE_CACHE_SIZE = 32  # Route tables kept (least recently used dropped first)
+NAV_JUMP_COST = 2  # Extra path cost of a jump over walking the same distance
+
 # Improved collision settings
 COLLISION_SUBSTEPS = 1  # Reduced for performance - single step collision
 WALL_PENETRATION_THRESHOLD = 3  # Slightly more tolerant for smoother movement
 PLAYER_KNOCKBACK_DISABLED = True  # Disable player knockback for better feel
 
 # World settings
-TILE_SIZE = 40
\ No newline at end of file
+TILE_SIZE = 40
+TILE_CHUNK_SIZE = 16  # Tiles per side of each pre-baked tile layer chunk
+TILE_DARKEN_ALPHA = 120  # Strength of the dark overlay baked into tiles
+
+# Profiler settings
+PROFILER_HISTORY = 240  # Frames kept for the overlay graph and statistics
+PROFILER_GRAPH_MS = 33.3  # Frame time that fills the overlay graph
+PROFILER_DUMP_SECONDS = 3  # Length of a profile capture
+PROFILER_TOGGLE_KEY = pygame.K_F3  # Show/hide the profiler overlay
+PROFILER_DUMP_KEY = pygame.K_F4  # Capture the next few seconds to a file
+
+# Internal render resolution: the world is drawn at a preset height and scaled to the display once per frame
+# Render presets are zoom levels as well as resolutions: the world is drawn 1:1 at the internal size,
+# so a lower preset shows less of the world, larger on screen
+RENDER_PRESETS = [('native', None), ('1080p', 1080), ('720p', 720), ('540p', 540)]  # (name, internal height)
+RENDER_PRESET = '1080p'  # Starting preset (presets at or above the display's height draw at native size)
+RENDER_PRESET_KEY = pygame.K_F2  # Cycle through the presets
+RENDER_HUD_NATIVE = True  # Draw the HUD after scaling, sharp at the display's resolution
+RENDER_SMOOTH_SCALE = False  # Bilinear upscaling (softer, slower) instead of nearest-neighbor
+
+# Adaptive effect quality: budgets drop when frames run over and climb back once there is headroom
+QUALITY_LEVELS = [  # (name, blur stamps per frame, trail segments, particle fraction, effects margin), lowest first
+    ('minimal', 0, 3, 0.25, CULL_MARGIN),  # Effects margin: how far outside the view impact effects still spawn
+    ('low', 40, 6, 0.5, 128),
+    ('medium', 120, 9, 0.75, 224),
+    ('high', 400, TRAIL_LENGTH, 1.0, LOD_FULL_MARGIN),
+]
+QUALITY_START = 'high'  # Level the governor starts at
+QUALITY_ADAPTIVE = True  # False pins the starting level
+QUALITY_WINDOW = 30  # Frames averaged for each decision (and waited after every change)
+QUALITY_DROP_LOAD = 0.9  # Drop a level when frames take more than this share of the 1/FPS budget
+QUALITY_RAISE_LOAD = 0.6  # Raise a level after QUALITY_RAISE_FRAMES frames below this share
+QUALITY_RAISE_FRAMES = 180  # Sustained headroom needed before raising (dropping takes one window)
+QUALITY_LOG_SIZE = 16  # Recent decisions kept for the overlay and logs
@@ -0,0 +1,110 @@
+import pygame
+from settings import (GRAVITY, JUMP_STRENGTH, PLAYER_MAX_SPEED, HEALTH_TANK_X, HEALTH_TANK_Y, HEALTH_TANK_WIDTH,
+                      HEALTH_TANK_HEIGHT, HEALTH_TANK_BORDER_COLOR, HEALTH_TANK_BACKGROUND_COLOR, HEALTH_BLOOD_COLOR)
+
+# Minimal versions of the enemy and health tank modules, used when those aren't in the checkout
+# (headless runs and benchmarks on a CI box). They keep the interfaces the game relies on.
+
+
+class Enemy:
+    """Stand-in archer: falls, collides with tiles and walks the navigation graph towards the player"""
+    def __init__(self, x, y, image, bow_img):
+        self.image = image
+        self.bow_img = bow_img
+        self.rect = image.get_rect(topleft=(x, y))
+        self.arrows = []  # Never fires; kept for code that draws or culls enemy arrows
+        self.angle = 0.0  # Bow angle, set by Game.aim_enemies
+        self.particle_system = None
+        self.navigation = None
+        self.health = 100
+        self.vel_x = 0.0
+        self.vel_y = 0.0
+        self.move_dir = 0  # Chosen by plan(): -1, 0 or 1
+        self.jump_wanted = False
+        self.on_ground = False
+        self.is_jumping = False
+
+    def plan(self, world, player):
+        """Pick a direction (and whether to jump) from the next waypoint towards the player"""
+        self.move_dir = 0
+        self.jump_wanted = False
+        if self.navigation is None:
+            return
+        waypoint = self.navigation.next_waypoint(self.rect.midbottom, player.rect.midbottom)
+        if waypoint is None:
+            return
+        dx = waypoint[0] - self.rect.centerx
+        if abs(dx) > 2:
+            self.move_dir = 1 if dx > 0 else -1
+        self.jump_wanted = waypoint[1] < self.rect.bottom - 1
+
+    def update(self, platforms, player, particle_system):
+        """Move one simulation step with gravity and tile collisions (platforms is the TileGrid)"""
+        if self.jump_wanted and self.on_ground:
+            self.vel_y = JUMP_STRENGTH  # Negative: upwards
+            self.jump_wanted = False
+        self.vel_x = self.vel_x * 0.8 + self.move_dir * PLAYER_MAX_SPEED * 0.1
+        self.vel_y += GRAVITY
+
+        self.rect.x += int(round(self.vel_x))
+        for tile in platforms.solid_tiles(self.rect):
+            if self.vel_x > 0:
+                self.rect.right = tile.left
+            elif self.vel_x < 0:
+                self.rect.left = tile.right
+            self.vel_x = 0.0
+
+        self.rect.y += int(round(self.vel_y))
+        self.on_ground = False
+        for tile in platforms.solid_tiles(self.rect):
+            if self.vel_y > 0:
+                self.rect.bottom = tile.top
+                self.on_ground = True
+            elif self.vel_y < 0:
+                self.rect.top = tile.bottom
+            self.vel_y = 0.0
+        self.is_jumping = not self.on_ground
+
+    def draw(self, screen, camera, player):
+        screen.blit(self.image, camera.apply(self.rect))
+
+    def draw_boss_health_bar(self, screen, view_width, view_height):
+        """The stand-in has no boss bar"""
+
+    def apply_knockback(self, force_x, force_y, duration_multiplier=1.0):
+        self.vel_x += force_x
+        self.vel_y += force_y
+
+    def take_damage(self, amount):
+        self.health -= amount
+
+
+class HealthBar:
+    """Stand-in health tank: a plain bar in the tank's place"""
+    def __init__(self, max_health=100):
+        self.max_health = max_health
+        self.current_health = max_health
+
+    def state(self):
+        """Everything the drawing depends on, for the cached HUD"""
+        return (self.current_health, self.max_health)
+
+    def update(self):
+        pass
+
+    def draw(self, screen):
+        rect = pygame.Rect(HEALTH_TANK_X, HEALTH_TANK_Y, HEALTH_TANK_WIDTH, HEALTH_TANK_HEIGHT)
+        pygame.draw.rect(screen, HEALTH_TANK_BACKGROUND_COLOR, rect)
+        fill = rect.copy()
+        fill.width = int(rect.width * max(self.current_health, 0) / self.max_health)
+        pygame.draw.rect(screen, HEALTH_BLOOD_COLOR, fill)
+        pygame.draw.rect(screen, HEALTH_TANK_BORDER_COLOR, rect, 2)
+
+    def take_damage(self, amount, is_void=False):
+        self.current_health = max(0, self.current_health - amount)
+
+    def heal(self, amount):
+        self.current_health = min(self.max_health, self.current_health + amount)
+
+    def reset(self):
+        self.current_health = self.max_health
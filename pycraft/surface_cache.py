@@ -0,0 +1,72 @@
+from collections import OrderedDict
+
+
+class SurfaceCache:
+    """LRU cache of surfaces derived from a source surface, capped by memory.
+
+    Entries are keyed by the source's id plus whatever else selects the variant (an angle, a
+    color). The source is stored in its entries, so its id cannot be reused while cached.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # (id(source), *key) -> [source, surface, bytes, extra or None]
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def entry(self, source, key):
+        """The [source, surface, bytes, extra] entry for a source and key (made most recent), or None"""
+        full_key = (id(source),) + key
+        entry = self.entries.get(full_key)
+        if entry is not None:
+            self.entries.move_to_end(full_key)
+        return entry
+
+    def add(self, source, key, surface):
+        """Cache a surface derived from source under key and return its entry"""
+        size = surface.get_width() * surface.get_height() * surface.get_bytesize()
+        entry = self.entries[(id(source),) + key] = [source, surface, size, None]
+        self.bytes += size
+        self.evict()
+        return entry
+
+    def grow(self, entry, size):
+        """Charge an entry for extra data kept alongside its surface (e.g. a mask)"""
+        entry[2] += size
+        self.bytes += size
+        self.evict()
+
+    def get(self, source, key, build):
+        """The cached surface for source and key, made with build() on a miss (shared, do not modify)"""
+        entry = self.entry(source, key)
+        if entry is None:
+            self.misses += 1
+            entry = self.add(source, key, build())
+        else:
+            self.hits += 1
+        return entry[1]
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits its memory cap (keeping the newest)"""
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, _, evicted_size, _) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every cached surface (counters are kept)"""
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        """Return hit rate and memory usage for tuning"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
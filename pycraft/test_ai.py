@@ -0,0 +1,49 @@
+import pygame
+from ai import AIScheduler
+
+
+class PlanningEnemy:
+    """Stand-in enemy that records when it was planned"""
+    def __init__(self, x):
+        self.rect = pygame.Rect(x, 0, 40, 80)
+        self.plans = []
+
+    def plan(self, world, player):
+        self.plans.append(self.step)
+
+
+def run_steps(scheduler, near, far, player, steps):
+    """Near enemies are due every step, far ones every fourth (like the reduced LOD tier)"""
+    for step in range(steps):
+        due = near + (far if step % 4 == 0 else [])
+        for enemy in near + far:
+            enemy.step = step
+        scheduler.run(due, None, player, near + far)
+
+
+def test_every_enemy_is_planned_within_a_bounded_wait():
+    # No budget: exactly one plan per step, the tightest the scheduler can be
+    scheduler = AIScheduler(budget_ms=0)
+    player = PlanningEnemy(0)
+    near = [PlanningEnemy(100 + 50 * i) for i in range(6)]
+    far = [PlanningEnemy(2000 + 50 * i) for i in range(4)]
+    steps = 600
+    run_steps(scheduler, near, far, player, steps)
+
+    max_gap = 120
+    for enemy in near + far:
+        assert enemy.plans, "enemy was never planned"
+        times = [-1] + enemy.plans + [steps]
+        assert max(b - a for a, b in zip(times, times[1:])) <= max_gap
+
+
+def test_waits_are_dropped_for_enemies_that_leave_the_game():
+    scheduler = AIScheduler(budget_ms=0)
+    player = PlanningEnemy(0)
+    enemies = [PlanningEnemy(100 * i) for i in range(3)]
+    run_steps(scheduler, enemies, [], player, 5)
+    assert set(scheduler.waits) == set(enemies)
+
+    gone = enemies.pop()
+    run_steps(scheduler, enemies, [], player, 1)
+    assert gone not in scheduler.waits
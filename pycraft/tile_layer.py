@@ -0,0 +1,73 @@
+import pygame
+from settings import TILE_CHUNK_SIZE, TILE_DARKEN_ALPHA
+from render_queue import render_queue, LAYER_TILES
+
+
+class TileLayer:
+    """Static tile renderer that bakes the level into cached chunk surfaces"""
+    def __init__(self, world, tile_image, chunk_size=TILE_CHUNK_SIZE):
+        self.world = world
+        self.chunk_size = chunk_size
+        self.chunk_pixels = chunk_size * world.tile_size
+        self.chunk_cols = -(-world.cols // chunk_size)
+        self.chunk_rows = -(-world.rows // chunk_size)
+        self.chunks = {}  # (chunk_col, chunk_row) -> Surface, or None if empty
+
+        # Darken the tile once instead of once per tile per frame
+        self.tile_image = tile_image.copy()
+        dark_overlay = pygame.Surface(tile_image.get_size())
+        dark_overlay.fill((0, 0, 0))
+        dark_overlay.set_alpha(TILE_DARKEN_ALPHA)
+        self.tile_image.blit(dark_overlay, (0, 0))
+
+    def bake_chunk(self, chunk_col, chunk_row):
+        """Render every solid tile of one chunk into a single surface"""
+        world = self.world
+        size = world.tile_size
+        col0 = chunk_col * self.chunk_size
+        row0 = chunk_row * self.chunk_size
+        col1 = min(col0 + self.chunk_size, world.cols)
+        row1 = min(row0 + self.chunk_size, world.rows)
+
+        tiles = [
+            (col - col0, row - row0)
+            for row in range(row0, row1)
+            for col in range(col0, col1)
+            if world.is_solid(col, row)
+        ]
+        if not tiles:
+            return None
+
+        surface = pygame.Surface(((col1 - col0) * size, (row1 - row0) * size), pygame.SRCALPHA)
+        surface.blits([(self.tile_image, (col * size, row * size)) for col, row in tiles], False)
+        return surface
+
+    def get_chunk(self, chunk_col, chunk_row):
+        """Return the baked surface for a chunk, baking it on first use"""
+        key = (chunk_col, chunk_row)
+        if key not in self.chunks:
+            self.chunks[key] = self.bake_chunk(chunk_col, chunk_row)
+        return self.chunks[key]
+
+    def invalidate(self, col, row):
+        """Drop the cached chunk containing a tile so it is re-baked after an edit"""
+        self.chunks.pop((col // self.chunk_size, row // self.chunk_size), None)
+
+    def draw(self, screen, camera):
+        """Blit only the chunks that intersect the camera viewport"""
+        view = camera.visible_rect()
+        pixels = self.chunk_pixels
+
+        chunk_col0 = max(view.left // pixels, 0)
+        chunk_row0 = max(view.top // pixels, 0)
+        chunk_col1 = min((view.right - 1) // pixels, self.chunk_cols - 1)
+        chunk_row1 = min((view.bottom - 1) // pixels, self.chunk_rows - 1)
+
+        drawn = 0
+        for chunk_row in range(chunk_row0, chunk_row1 + 1):
+            for chunk_col in range(chunk_col0, chunk_col1 + 1):
+                chunk = self.get_chunk(chunk_col, chunk_row)
+                if chunk is not None:
+                    render_queue.submit(chunk, (chunk_col * pixels, chunk_row * pixels), LAYER_TILES)
+                    drawn += 1
+        camera.count('tile chunks', drawn, self.chunk_cols * self.chunk_rows - drawn)
@@ -0,0 +1,28 @@
+from settings import SIM_STEP, MAX_FRAME_TIME
+
+
+class SimClock:
+    """Fixed-step simulation clock shared by every subsystem"""
+    def __init__(self, step=SIM_STEP, max_frame_time=MAX_FRAME_TIME):
+        self.step = step  # Seconds simulated per tick
+        self.max_frame_time = max_frame_time  # Clamp so a long stall can't snowball
+        self.time = 0.0  # Simulated seconds since start
+        self.steps = 0
+        self.accumulator = 0.0
+
+    def advance(self, frame_time):
+        """Add real frame time and return how many simulation steps are due"""
+        self.accumulator += min(frame_time, self.max_frame_time)
+        steps = int(self.accumulator // self.step)
+        self.accumulator -= steps * self.step
+        return steps
+
+    def tick(self):
+        """Advance simulated time by one step"""
+        self.time += self.step
+        self.steps += 1
+
+    @property
+    def alpha(self):
+        """How far rendering is between the last two simulation steps (0.0 to 1.0)"""
+        return self.accumulator / self.step
@@ -0,0 +1,32 @@
+import pygame
+from surface_cache import SurfaceCache
+from settings import TINT_CACHE_MAX_BYTES
+
+
+class TintCache(SurfaceCache):
+    """LRU cache of color-blended sprites (tints, damage flashes), capped by memory"""
+    def __init__(self, max_bytes=TINT_CACHE_MAX_BYTES):
+        super().__init__(max_bytes)
+
+    def tint(self, surface, color, blend=pygame.BLEND_MULT):
+        """Return surface blended with a solid RGBA color (shared, do not modify)"""
+        color = tuple(color)
+        return self.get(surface, (color, blend), lambda: self.blend(surface, color, blend))
+
+    @staticmethod
+    def blend(surface, color, blend):
+        """A copy of surface blended with a solid color"""
+        tint_surface = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+        tint_surface.fill(color)
+        tinted = surface.copy()
+        tinted.blit(tint_surface, (0, 0), special_flags=blend)
+        return tinted
+
+
+# Shared by every tinted sprite: arrows, the bow's nocked arrow and damage flashes
+tint_cache = TintCache()
+
+
+def tint(surface, color, blend=pygame.BLEND_MULT):
+    """Cached surface.copy() blended with a solid RGBA color"""
+    return tint_cache.tint(surface, color, blend)
@@ -32,6 +32,12 @@ class Trail:
         """Draw the trail on screen"""
         if len(self.positions) < 2:
             return
+        # Whole trail off screen (bounding box of its points)
+        xs = [x for x, _ in self.positions]
+        ys = [y for _, y in self.positions]
+        bounds = pygame.Rect(min(xs), min(ys), max(xs) - min(xs) + 1, max(ys) - min(ys) + 1)
+        if not camera.is_visible(bounds, TRAIL_WIDTH, 'trails'):
+            return
             
         # Draw trail segments with fading effect
         for i in range(len(self.positions) - 1):
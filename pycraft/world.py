@@ -0,0 +1,82 @@
+import pygame
+import numpy as np
+from settings import TILE_SIZE
+
+SOLID_TILES = "X"  # Map characters that block movement
+
+
+class TileGrid:
+    """Compact tile grid built from a level map, indexed by (col, row); static once loaded"""
+    def __init__(self, level_map, tile_size=TILE_SIZE):
+        self.tile_size = tile_size
+        self.rows = len(level_map)
+        self.cols = max((len(row) for row in level_map), default=0)
+        self.width = self.cols * tile_size
+        self.height = self.rows * tile_size
+
+        # One byte per cell, row-major: 1 = solid, 0 = empty
+        self.cells = bytearray(self.cols * self.rows)
+        for row_index, row in enumerate(level_map):
+            for col_index, tile in enumerate(row):
+                if tile in SOLID_TILES:
+                    self.cells[row_index * self.cols + col_index] = 1
+        self.solid_count = self.cells.count(1)
+        # (rows, cols) NumPy view sharing the same memory, for bulk queries
+        self.array = np.frombuffer(self.cells, dtype=np.uint8).reshape(self.rows, self.cols)
+        self.solid_rects = None  # Rect per solid tile, built on first iteration
+
+    def is_solid(self, col, row):
+        """Return True if the cell at (col, row) is a solid tile"""
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return self.cells[row * self.cols + col] != 0
+        return False
+
+    def cell_at(self, x, y):
+        """Return the (col, row) cell containing world point (x, y)"""
+        return int(x // self.tile_size), int(y // self.tile_size)
+
+    def tile_rect(self, col, row):
+        """Return the world rect covered by the cell at (col, row)"""
+        size = self.tile_size
+        return pygame.Rect(col * size, row * size, size, size)
+
+    def cell_range(self, rect):
+        """Return the clamped (col0, row0, col1, row1) cells touched by rect, inclusive"""
+        size = self.tile_size
+        col0 = max(rect.left // size, 0)
+        row0 = max(rect.top // size, 0)
+        col1 = min((rect.right - 1) // size, self.cols - 1)
+        row1 = min((rect.bottom - 1) // size, self.rows - 1)
+        return col0, row0, col1, row1
+
+    def solid_tiles(self, rect):
+        """Return rects of all solid tiles overlapping rect, in row-major order"""
+        col0, row0, col1, row1 = self.cell_range(rect)
+        cells = self.cells
+        cols = self.cols
+        hits = []
+        for row in range(row0, row1 + 1):
+            base = row * cols
+            for col in range(col0, col1 + 1):
+                if cells[base + col]:
+                    hits.append(self.tile_rect(col, row))
+        return hits
+
+    def solid_cells(self, cols, rows):
+        """Bulk is_solid: bool array for arrays of cell coordinates (outside the grid is empty)"""
+        inside = (cols >= 0) & (cols < self.cols) & (rows >= 0) & (rows < self.rows)
+        solid = np.zeros(np.shape(cols), np.bool_)
+        solid[inside] = self.array[rows[inside], cols[inside]] != 0
+        return solid
+
+    def __iter__(self):
+        """Iterate a rect for every solid tile (for code that still scans platforms)"""
+        if self.solid_rects is None:
+            # The grid is static after load (tile chunks and the nav graph rely on it too), so build once
+            cols = self.cols
+            self.solid_rects = [self.tile_rect(index % cols, index // cols)
+                                for index, cell in enumerate(self.cells) if cell]
+        return iter(self.solid_rects)
+
+    def __len__(self):
+        return self.solid_count